@@ -1,28 +1,138 @@
 from datetime import datetime, timedelta
+import base64
+import binascii
+import hashlib
+import hmac
+import json
 import os
-from jose import JWTError, jwt
+import time
 from fastapi import HTTPException, status
 
+from cache import MISSING, TTLCache
+
 # Secret key for JWT encoding/decoding (keep secret!)
 # Reads from env for easier configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "change-me")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+# Serve /dashboard straight from verified token claims, without reading the user record.
+TRUST_TOKEN_CLAIMS = os.getenv("TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+# Bump to force every user to log in again; tokens from an older epoch are rejected.
+TOKEN_EPOCH = int(os.getenv("TOKEN_EPOCH", "0"))
+# Verified tokens are remembered (up to their exp) so repeat requests skip verification.
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", "300"))
+
+
+def _load_signing_keys() -> dict:
+    """Parse JWT_KEYS="kid1:secret1,kid2:secret2" for key rotation."""
+    keys = {}
+    for pair in os.getenv("JWT_KEYS", "").split(","):
+        if ":" in pair:
+            kid, secret = pair.split(":", 1)
+            keys[kid.strip()] = secret.strip()
+    return keys
+
+
+# New tokens are signed with JWT_ACTIVE_KID and carry it as the `kid` header. Tokens
+# without a kid are verified with SECRET_KEY, so tokens issued before rotation keep working;
+# set JWT_ACCEPT_UNKEYED=false once those have expired to reject kid-less tokens outright.
+SIGNING_KEYS = _load_signing_keys()
+ACTIVE_KID = os.getenv("JWT_ACTIVE_KID") or next(iter(SIGNING_KEYS), None)
+JWT_ACCEPT_UNKEYED = os.getenv("JWT_ACCEPT_UNKEYED", "true").lower() != "false"
+
+# Misconfiguration should fail the deploy at import, not every login at runtime.
+if ACTIVE_KID and ACTIVE_KID not in SIGNING_KEYS:
+    raise RuntimeError(f"JWT_ACTIVE_KID={ACTIVE_KID!r} is not one of the kids in JWT_KEYS")
+if not JWT_ACCEPT_UNKEYED and not ACTIVE_KID:
+    raise RuntimeError("JWT_ACCEPT_UNKEYED=false needs JWT_KEYS, or no token could be verified")
+
+# Prepared HMAC-SHA256 states: the key is padded and absorbed once, each verify copies.
+_signers = {kid: hmac.new(secret.encode(), digestmod=hashlib.sha256) for kid, secret in SIGNING_KEYS.items()}
+_default_signer = hmac.new(SECRET_KEY.encode(), digestmod=hashlib.sha256)
+_verified_tokens = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def profile_claims(user: dict) -> dict:
+    """Claims embedded at login so /dashboard can be served from the token alone."""
+    return {
+        "sub": user["email"],
+        "name": user["name"],
+        "ver": int(user.get("token_version", 0)),
+    }
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     """Generate JWT token"""
+    # Imported here: only /login signs tokens, so other cold starts skip jose/cryptography.
+    from jose import jwt
+
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "epoch": TOKEN_EPOCH})
+    if ACTIVE_KID:
+        return jwt.encode(to_encode, SIGNING_KEYS[ACTIVE_KID], algorithm=ALGORITHM, headers={"kid": ACTIVE_KID})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def verify_token(token: str) -> dict:
+    """Check an HS256 JWT's signature, exp and nbf with a prepared signer; return its claims."""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = json.loads(_b64decode(header_b64))
+        if header.get("alg") != ALGORITHM:
+            raise InvalidToken("unexpected alg")
+        kid = header.get("kid")
+        if not kid and not JWT_ACCEPT_UNKEYED:
+            raise InvalidToken("missing kid")
+        signer = _signers.get(kid) if kid else _default_signer
+        if signer is None:
+            raise InvalidToken("unknown kid")
+        mac = signer.copy()
+        mac.update(f"{header_b64}.{payload_b64}".encode("ascii"))
+        if not hmac.compare_digest(mac.digest(), _b64decode(signature_b64)):
+            raise InvalidToken("bad signature")
+        payload = json.loads(_b64decode(payload_b64))
+    except (ValueError, TypeError, AttributeError, UnicodeError, binascii.Error) as e:
+        raise InvalidToken(str(e))
+    if not isinstance(payload, dict):
+        raise InvalidToken("claims are not an object")
+    now = time.time()
+    try:
+        if "exp" in payload and now >= float(payload["exp"]):
+            raise InvalidToken("expired")
+        if "nbf" in payload and now < float(payload["nbf"]):
+            raise InvalidToken("not yet valid")
+    except (TypeError, ValueError):
+        raise InvalidToken("bad time claim")
+    return payload
+
+
+def decode_token_claims(token: str) -> dict:
+    """Verify a JWT and return all of its claims (cached until exp; treat as read-only)"""
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = _verified_tokens.get(cache_key)
+    if payload is MISSING:
+        try:
+            payload = verify_token(token)
+        except InvalidToken:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+        ttl = min(TOKEN_CACHE_TTL, float(payload["exp"]) - time.time()) if "exp" in payload else TOKEN_CACHE_TTL
+        _verified_tokens.set(cache_key, payload, ttl=ttl)
+    if payload.get("epoch", 0) < TOKEN_EPOCH:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+    return payload
+
+
 def decode_access_token(token: str):
     """Decode JWT token and return payload"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("sub")
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    return decode_token_claims(token).get("sub")
@@ -0,0 +1,106 @@
+# dashboard-app/backend/dynamo.py
+
+"""Async DynamoDB table access on a long-lived aiobotocore client.
+
+AsyncTable mirrors the boto3 Table resource calls the backend uses
+(get_item/put_item/update_item with plain Python values), so request
+handlers can await DynamoDB instead of parking a threadpool thread on the
+network round trip. The client and its connection pool are created on first
+use and reused for every later call on the same event loop. Mangum keeps
+one loop per Lambda container, so that is one client per container.
+
+DYNAMODB_ENDPOINT_URL points both this client and the boto3 resources at a
+local stand-in such as DynamoDB Local.
+"""
+
+import asyncio
+import os
+
+DYNAMODB_ENDPOINT_URL = os.getenv("DYNAMODB_ENDPOINT_URL") or None
+DYNAMODB_MAX_CONNECTIONS = int(os.getenv("DYNAMODB_MAX_CONNECTIONS", "50"))
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+
+_VALUE_KEYS = ("Key", "Item", "ExpressionAttributeValues", "ExclusiveStartKey")
+_RESULT_KEYS = ("Item", "Attributes", "LastEvaluatedKey")
+
+
+class AsyncTable:
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+        self._client = None
+        self._exit_stack = None
+        self._loop = None
+        self._lock = None
+        self._serializer = None
+        self._deserializer = None
+
+    def warm_up(self):
+        """Import the client stack ahead of time; the client itself needs a running loop."""
+        if self._serializer is None:
+            import aiobotocore.session  # noqa: F401
+            from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+            self._serializer, self._deserializer = TypeSerializer(), TypeDeserializer()
+
+    async def _get_client(self):
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is loop:
+            return self._client
+        if self._lock is None or self._loop is not loop:
+            # Clients (and asyncio locks) belong to one loop; start over on a new one.
+            self._client, self._loop, self._lock = None, loop, asyncio.Lock()
+        async with self._lock:
+            if self._client is None:
+                from contextlib import AsyncExitStack
+                from aiobotocore.config import AioConfig
+                from aiobotocore.session import get_session
+
+                self.warm_up()
+                exit_stack = AsyncExitStack()
+                self._client = await exit_stack.enter_async_context(
+                    get_session().create_client(
+                        "dynamodb",
+                        region_name=AWS_REGION,
+                        endpoint_url=DYNAMODB_ENDPOINT_URL,
+                        config=AioConfig(max_pool_connections=DYNAMODB_MAX_CONNECTIONS),
+                    )
+                )
+                self._exit_stack = exit_stack
+        return self._client
+
+    def _serialize(self, kwargs: dict) -> dict:
+        request = {"TableName": self.table_name, **kwargs}
+        for key in _VALUE_KEYS:
+            if key in request:
+                request[key] = {k: self._serializer.serialize(v) for k, v in request[key].items()}
+        return request
+
+    def _deserialize(self, response: dict) -> dict:
+        for key in _RESULT_KEYS:
+            if key in response:
+                response[key] = {k: self._deserializer.deserialize(v) for k, v in response[key].items()}
+        if "Items" in response:
+            response["Items"] = [
+                {k: self._deserializer.deserialize(v) for k, v in item.items()} for item in response["Items"]
+            ]
+        return response
+
+    async def _call(self, operation: str, **kwargs) -> dict:
+        client = await self._get_client()
+        response = await getattr(client, operation)(**self._serialize(kwargs))
+        return self._deserialize(response)
+
+    async def get_item(self, **kwargs) -> dict:
+        return await self._call("get_item", **kwargs)
+
+    async def put_item(self, **kwargs) -> dict:
+        return await self._call("put_item", **kwargs)
+
+    async def update_item(self, **kwargs) -> dict:
+        return await self._call("update_item", **kwargs)
+
+    async def close(self):
+        """Close the client's connections (scripts and tests; Lambda just freezes)."""
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+        self._client = self._exit_stack = None
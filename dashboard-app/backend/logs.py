@@ -0,0 +1,115 @@
+# dashboard-app/backend/logs.py
+
+"""Structured JSON logging with per-request IDs and sampling.
+
+Records are handed to a queue on the request path and written to stdout by
+a background listener thread, so a request never waits on log I/O.
+
+Environment:
+    LOG_LEVEL        minimum level (default INFO)
+    LOG_SAMPLE_RATE  fraction of successful, fast requests to log (default 1.0)
+    LOG_SLOW_MS      requests slower than this are always logged (default 1000)
+    LOG_ASYNC        "false" writes synchronously, e.g. when debugging (default true)
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+LOG_SLOW_MS = float(os.getenv("LOG_SLOW_MS", "1000"))
+LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() != "false"
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+logger = logging.getLogger("dashboard")
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request ID. Runs in the caller's context, before queueing."""
+
+    def filter(self, record):
+        record.request_id = request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class JsonQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves exc_info on the record so JsonFormatter can emit "exc".
+
+    The stock prepare() folds the traceback into msg and clears exc_info.
+    Here only the message args are merged; the traceback is rendered on the
+    listener thread.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure_logging():
+    """Attach the JSON handler to the "dashboard" logger. Safe to call more than once."""
+    if logger.handlers:
+        return logger
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter())
+    if LOG_ASYNC:
+        log_queue = queue.SimpleQueue()
+        handler = JsonQueueHandler(log_queue)
+        listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+    else:
+        handler = stream
+    handler.addFilter(RequestIdFilter())
+    logger.addHandler(handler)
+    logger.setLevel(LOG_LEVEL)
+    # The Lambda runtime installs its own root handler; don't log everything twice.
+    logger.propagate = False
+    return logger
+
+
+def should_log(status_code: int, duration_ms: float) -> bool:
+    """Errors and slow requests are always logged; the rest are sampled."""
+    if status_code >= 400 or duration_ms >= LOG_SLOW_MS:
+        return True
+    return LOG_SAMPLE_RATE >= 1.0 or random.random() < LOG_SAMPLE_RATE
+
+
+def log_request(method: str, path: str, status_code: int, started: float, **fields):
+    duration_ms = (time.perf_counter() - started) * 1000
+    if not should_log(status_code, duration_ms):
+        return
+    logger.info("request", extra={"fields": {
+        "method": method,
+        "path": path,
+        "status": status_code,
+        "duration_ms": round(duration_ms, 2),
+        **fields,
+    }})
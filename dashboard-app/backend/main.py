@@ -1,21 +1,39 @@
 # dashboard-app/backend/main.py
 
+import hmac
+import math
 import os
 import sys
+import time
+import uuid
 
 from fastapi import FastAPI, Depends, HTTPException, status, Request, Path
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from mangum import Mangum
 
-from auth import create_access_token, decode_access_token
-from users import get_user, verify_password
+import metrics
+from logs import configure_logging, log_request, logger, request_id
+from ratelimit import make_login_limiter
+from static_assets import StaticAssets
+from auth import TRUST_TOKEN_CLAIMS, create_access_token, decode_token_claims, profile_claims
+from users import (
+    MISSING, HashPoolBusy, get_user, peek_user, token_version, update_password_hash, verify_and_update_async,
+    warm_up,
+)
+
+# Set DEBUG_STARTUP=true to verify the ZIP layout in CloudWatch; off by default as it slows cold starts.
+if os.getenv("DEBUG_STARTUP", "false").lower() == "true":
+    print("👀 sys.path:", sys.path)
+    print("📂 cwd:", os.getcwd())
+    print("📦 contents:", os.listdir("."))
 
-print("👀 sys.path:", sys.path)
-print("📂 cwd:", os.getcwd())
-print("📦 contents:", os.listdir("."))  # keep this if you still want to verify your ZIP contents
+# Dependencies initialise lazily on first use; EAGER_INIT=true builds them during init instead
+# (worthwhile with provisioned concurrency or SnapStart, where init time is not billed to users).
+if os.getenv("EAGER_INIT", "false").lower() == "true":
+    warm_up()
 
 app = FastAPI(
     title="Daniel & Kristan Dashboard API",
@@ -23,11 +41,41 @@ app = FastAPI(
     version="1.0.0"
 )
 
+configure_logging()
+
 @app.middleware("http")
 async def log_all_requests(request: Request, call_next):
-    print(f"➡️ {request.method} {request.url.path}")
+    # Prefer the caller's ID, then Lambda's, so log lines join up with CloudWatch/API Gateway.
+    aws_context = request.scope.get("aws.context")
+    rid = (
+        request.headers.get("x-request-id")
+        or getattr(aws_context, "aws_request_id", None)
+        or uuid.uuid4().hex
+    )
+    token = request_id.set(rid)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        logger.exception("unhandled error", extra={"fields": {"method": request.method, "path": request.url.path}})
+        raise
+    finally:
+        request_id.reset(token)
+    response.headers["X-Request-ID"] = rid
+    log_request(request.method, request.url.path, response.status_code, started, request_id=rid)
+    return response
+
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    started = time.perf_counter()
     response = await call_next(request)
-    print("DEBUG response status:", response.status_code)
+    elapsed = time.perf_counter() - started
+    # Label by route template, not raw path, so /public/{filename} stays one series.
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", "unmatched")
+    metrics.observe("http_request_duration_seconds", elapsed, method=request.method, route=route_path)
+    metrics.inc("http_requests_total", method=request.method, route=route_path, status=response.status_code)
+    metrics.mark_warm()
     return response
 
 # CORS
@@ -39,40 +87,102 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Serve SPA
-app.mount("/public", StaticFiles(directory="public"), name="public")
+# Serve SPA: public/ is indexed (and small files preloaded) once per container.
+static_assets = StaticAssets()
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+# Without a token /metrics is closed unless it is deliberately opened (e.g. behind a private network).
+METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").lower() == "true"
 
-@app.get("/login")
-def serve_login():
-    return FileResponse("public/index.html")
+@app.get("/healthz")
+async def healthz():
+    """Liveness probe; touches no external services."""
+    return {"status": "ok", "cold_start": metrics.COLD_START}
+
+@app.get("/metrics")
+async def read_metrics(request: Request):
+    """Prometheus text exposition of in-process metrics, behind a METRICS_TOKEN bearer token."""
+    if METRICS_TOKEN:
+        supplied = request.headers.get("authorization", "").encode()
+        if not hmac.compare_digest(supplied, f"Bearer {METRICS_TOKEN}".encode()):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
+    elif not METRICS_PUBLIC:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# Plain def: assets over STATIC_PRELOAD_MAX_BYTES are read from disk, so run on the threadpool.
+@app.api_route("/login", methods=["GET", "HEAD"])
+def serve_login(request: Request):
+    response = static_assets.response(request, "index.html")
+    if response is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    return response
 
 # Make sure tokenUrl matches your POST /login endpoint
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
+login_limiter = make_login_limiter()
+
 @app.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
     email = form_data.username.lower()
-    print(f"📨 Login attempt: {email}")
-    user = get_user(email)
-    print(f"🔍 Found user: {user}")
-    if not user or not verify_password(form_data.password, user["password"]):
-        print("❌ Invalid credentials")
+    client_ip = request.client.host if request.client else "unknown"
+    if login_limiter.store.remote:
+        throttled = await run_in_threadpool(login_limiter.check, client_ip, email)
+    else:
+        throttled = login_limiter.check(client_ip, email)
+    if throttled:
+        scope, retry_after = throttled
+        metrics.inc("login_throttled_total", scope=scope)
+        logger.warning("login throttled", extra={"fields": {"email": email, "client_ip": client_ip, "scope": scope}})
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, slow down",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    user = await get_user(email)
+    valid, new_hash = False, None
+    try:
+        if user:
+            valid, new_hash = await verify_and_update_async(form_data.password, user["password"])
+    except HashPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    if not valid:
+        logger.info("login failed", extra={"fields": {"email": email, "user_found": bool(user)}})
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    access_token = create_access_token(data={"sub": email})
-    print("✅ Login successful, token generated")
+    if new_hash:
+        # Stored hash uses an outdated bcrypt cost; upgrade it now that we know the password.
+        await update_password_hash(email, user["password"], new_hash)
+    access_token = create_access_token(data=profile_claims(user))
+    logger.info("login succeeded", extra={"fields": {"email": email}})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.get("/dashboard")
-def read_dashboard(request: Request, token: str = Depends(oauth2_scheme)):
+async def read_dashboard(request: Request, token: str = Depends(oauth2_scheme)):
     if not token:
         auth_header = request.headers.get("authorization", "")
         if auth_header.startswith("Bearer "):
             token = auth_header.split(" ", 1)[1]
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token missing")
-    email = decode_access_token(token)
-    user = get_user(email)
-    if not user:
+    claims = decode_token_claims(token)
+    email = claims.get("sub")
+    if TRUST_TOKEN_CLAIMS and "name" in claims:
+        # Zero-I/O path. Revocation is honoured when this instance has the record cached;
+        # otherwise the token is trusted until it expires.
+        cached = peek_user(email)
+        if cached is MISSING or (cached and token_version(cached) == claims.get("ver", 0)):
+            return {
+                "user": claims["name"],
+                "email": email,
+                "content": f"Welcome {claims['name']}!"
+            }
+    user = await get_user(email)
+    if not user or token_version(user) != claims.get("ver", 0):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized user")
     return {
         "user": user["name"],
@@ -80,12 +190,12 @@ def read_dashboard(request: Request, token: str = Depends(oauth2_scheme)):
         "content": f"Welcome {user['name']}!"
     }
 
-@app.get("/public/{filename:path}")
-def serve_static(filename: str = Path(...)):
-    full_path = os.path.join("public", filename)
-    if not os.path.isfile(full_path):
+@app.api_route("/public/{filename:path}", methods=["GET", "HEAD"])
+def serve_static(request: Request, filename: str = Path(...)):
+    response = static_assets.response(request, filename)
+    if response is None:
         raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(full_path)
+    return response
 
 # Lambda handler
 handler = Mangum(app)
@@ -0,0 +1,122 @@
+# dashboard-app/backend/metrics.py
+
+"""In-process counters and latency histograms, rendered in Prometheus text format.
+
+Everything lives in module globals so values survive across warm Lambda
+invocations. Recording is a dict lookup plus a few additions under one lock.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Seconds; tuned for a Lambda API where bcrypt sits around 250 ms.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+START_TIME = time.time()
+COLD_START = True
+
+_HELP = {
+    "http_requests_total": ("counter", "HTTP requests by method, route and status."),
+    "http_request_duration_seconds": ("histogram", "HTTP request latency by method and route."),
+    "dynamodb_call_duration_seconds": ("histogram", "DynamoDB call latency by operation."),
+    "bcrypt_verify_duration_seconds": ("histogram", "Time spent verifying a bcrypt password hash."),
+    "bcrypt_rejected_total": ("counter", "Password checks refused because the bcrypt queue was full."),
+    "login_throttled_total": ("counter", "Login attempts rejected by the rate limiter, by scope (ip or account)."),
+    "password_rehash_total": ("counter", "Stored password hashes upgraded to the current bcrypt cost."),
+    "user_cache_requests_total": ("counter", "User record lookups by cache result (hit or miss)."),
+}
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    """Add `value` to a counter."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, seconds, **labels):
+    """Record one observation in a histogram."""
+    key = _key(name, labels)
+    index = bisect_left(DEFAULT_BUCKETS, seconds)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [[0] * (len(DEFAULT_BUCKETS) + 1), 0.0, 0]
+        hist[0][index] += 1
+        hist[1] += seconds
+        hist[2] += 1
+
+
+@contextmanager
+def timed(name, **labels):
+    """Observe the duration of the wrapped block, including when it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def mark_warm():
+    global COLD_START
+    COLD_START = False
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _header(lines, seen, name, fallback_type):
+    if name in seen:
+        return
+    seen.add(name)
+    metric_type, help_text = _HELP.get(name, (fallback_type, name))
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {metric_type}")
+
+
+def render() -> str:
+    """Return all metrics in the Prometheus text exposition format (0.0.4)."""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: (list(v[0]), v[1], v[2]) for k, v in _histograms.items()}
+
+    lines = [
+        "# HELP process_start_time_seconds Unix time this instance was initialised.",
+        "# TYPE process_start_time_seconds gauge",
+        f"process_start_time_seconds {START_TIME:.3f}",
+        "# HELP process_cold_start 1 until this instance has finished its first request.",
+        "# TYPE process_cold_start gauge",
+        f"process_cold_start {int(COLD_START)}",
+    ]
+    seen = set()
+    for (name, labels), value in sorted(counters.items()):
+        _header(lines, seen, name, "counter")
+        lines.append(f"{name}{_fmt_labels(labels)} {value}")
+    for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+        _header(lines, seen, name, "histogram")
+        cumulative = 0
+        for bound, bucket in zip(DEFAULT_BUCKETS, buckets):
+            cumulative += bucket
+            lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', '+Inf')])} {count}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {total:.6f}")
+        lines.append(f"{name}_count{_fmt_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
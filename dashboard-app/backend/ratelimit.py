@@ -0,0 +1,132 @@
+# dashboard-app/backend/ratelimit.py
+
+"""Token-bucket rate limiting for /login.
+
+Buckets are kept in process memory by default, which is enough to cap the
+bcrypt and DynamoDB work a single instance will do. Set
+RATE_LIMIT_STORE=dynamodb to share buckets across Lambda instances through
+a table keyed on "key" (string), with a TTL on "expires_at".
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from botocore.exceptions import ClientError
+
+from dynamo import DYNAMODB_ENDPOINT_URL
+
+RATE_LIMIT_STORE = os.getenv("RATE_LIMIT_STORE", "memory")
+RATE_LIMIT_TABLE = os.getenv("RATE_LIMIT_TABLE", "dashboard-rate-limits")
+# Burst size and sustained attempts per minute, per client IP and per account.
+LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", "20"))
+LOGIN_IP_PER_MINUTE = float(os.getenv("LOGIN_IP_PER_MINUTE", "10"))
+LOGIN_ACCOUNT_BURST = int(os.getenv("LOGIN_ACCOUNT_BURST", "5"))
+LOGIN_ACCOUNT_PER_MINUTE = float(os.getenv("LOGIN_ACCOUNT_PER_MINUTE", "3"))
+
+
+def _refill(tokens, updated_at, now, capacity, per_second):
+    return min(capacity, tokens + (now - updated_at) * per_second)
+
+
+class InMemoryStore:
+    """Buckets in a bounded LRU dict; the oldest idle keys are dropped first."""
+
+    remote = False
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, per_second: float) -> float:
+        """Consume one token. Returns 0 if allowed, else seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated_at, now, capacity, per_second)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / per_second
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class DynamoDBStore:
+    """Buckets shared through DynamoDB, updated with optimistic concurrency."""
+
+    remote = True
+
+    def __init__(self, table_name: str = RATE_LIMIT_TABLE, retries: int = 3):
+        import boto3
+
+        dynamodb = boto3.resource(
+            "dynamodb",
+            region_name=os.getenv("AWS_REGION", "us-east-1"),
+            endpoint_url=DYNAMODB_ENDPOINT_URL,
+        )
+        self.table = dynamodb.Table(table_name)
+        self.retries = retries
+
+    def take(self, key: str, capacity: int, per_second: float) -> float:
+        for _ in range(self.retries):
+            now = time.time()
+            item = self.table.get_item(Key={"key": key}, ConsistentRead=True).get("Item")
+            if item:
+                tokens = _refill(float(item["tokens"]), float(item["updated_at"]), now, capacity, per_second)
+            else:
+                tokens = float(capacity)
+            if tokens < 1:
+                return (1 - tokens) / per_second
+            if item:
+                guard = {"ConditionExpression": "updated_at = :prev",
+                         "ExpressionAttributeValues": {":prev": item["updated_at"]}}
+            else:
+                guard = {"ConditionExpression": "attribute_not_exists(#k)",
+                         "ExpressionAttributeNames": {"#k": "key"}}
+            try:
+                self.table.put_item(
+                    Item={
+                        "key": key,
+                        "tokens": str(tokens - 1),
+                        "updated_at": str(now),
+                        # The bucket is full again by then; let DynamoDB TTL remove it.
+                        "expires_at": math.ceil(now + capacity / per_second),
+                    },
+                    **guard,
+                )
+                return 0.0
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+        # Lost every race: others are hammering this key, so treat it as exhausted.
+        return 1 / per_second
+
+
+class LoginRateLimiter:
+    """Per-IP and per-account buckets, checked before any user lookup or bcrypt work."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def check(self, client_ip: str, email: str):
+        """Returns None if the attempt may proceed, else (scope, retry_after_seconds)."""
+        wait = self.store.take(f"login-ip#{client_ip}", LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE / 60)
+        if wait:
+            return "ip", wait
+        wait = self.store.take(f"login-account#{email}", LOGIN_ACCOUNT_BURST, LOGIN_ACCOUNT_PER_MINUTE / 60)
+        if wait:
+            return "account", wait
+        return None
+
+
+def make_login_limiter() -> LoginRateLimiter:
+    store = DynamoDBStore() if RATE_LIMIT_STORE == "dynamodb" else InMemoryStore()
+    return LoginRateLimiter(store)
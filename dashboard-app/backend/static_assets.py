@@ -0,0 +1,145 @@
+# dashboard-app/backend/static_assets.py
+
+"""Static file serving for /public with strong ETags, 304s and byte ranges.
+
+The public/ tree is indexed once at import: every file gets a SHA-256 ETag,
+and files up to STATIC_PRELOAD_MAX_BYTES are kept in memory, so warm Lambda
+invocations serve them without touching the filesystem. Cache-Control lets
+browsers and CloudFront answer repeat visits without invoking Lambda at all.
+"""
+
+import hashlib
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+
+from fastapi import Request
+from fastapi.responses import Response
+
+STATIC_DIR = os.getenv("STATIC_DIR", "public")
+STATIC_PRELOAD_MAX_BYTES = int(os.getenv("STATIC_PRELOAD_MAX_BYTES", str(256 * 1024)))
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "86400"))
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_HTML = "no-cache"
+# Content-hashed names such as IMG_1441-640.3f2a9c1d.webp never change content.
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{8,}\.[a-z0-9]+$")
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class Asset:
+    __slots__ = ("path", "size", "etag", "content_type", "cache_control", "last_modified", "data")
+
+    def __init__(self, path: str, rel_path: str, preload_max_bytes: int):
+        self.path = path
+        self.size = os.path.getsize(path)
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            data = f.read() if self.size <= preload_max_bytes else None
+            if data is not None:
+                digest.update(data)
+            else:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        self.data = data
+        self.etag = f'"{digest.hexdigest()[:32]}"'
+        self.content_type = mimetypes.guess_type(rel_path)[0] or "application/octet-stream"
+        if self.content_type.startswith("text/"):
+            self.content_type += "; charset=utf-8"
+        if HASHED_NAME_RE.search(rel_path):
+            self.cache_control = CACHE_IMMUTABLE
+        elif rel_path.endswith(".html"):
+            self.cache_control = CACHE_HTML
+        else:
+            self.cache_control = f"public, max-age={STATIC_MAX_AGE}"
+        self.last_modified = formatdate(os.path.getmtime(path), usegmt=True)
+
+    def read(self, start: int = 0, end: int = None) -> bytes:
+        """Bytes [start, end] inclusive, from memory when preloaded."""
+        end = self.size - 1 if end is None else end
+        if self.data is not None:
+            return self.data[start:end + 1]
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start + 1)
+
+
+class StaticAssets:
+    def __init__(self, root: str = STATIC_DIR, preload_max_bytes: int = STATIC_PRELOAD_MAX_BYTES):
+        self.root = root
+        self.assets = {}
+        if not os.path.isdir(root):
+            return
+        for dirpath, _, names in os.walk(root):
+            for name in names:
+                path = os.path.join(dirpath, name)
+                rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+                self.assets[rel_path] = Asset(path, rel_path, preload_max_bytes)
+
+    def get(self, rel_path: str):
+        # Only indexed files are served, so "../" tricks simply miss.
+        return self.assets.get(rel_path)
+
+    def response(self, request: Request, rel_path: str):
+        """Serve an asset honouring If-None-Match, Range and If-Range; None if unknown."""
+        asset = self.get(rel_path)
+        if asset is None:
+            return None
+        headers = {
+            "ETag": asset.etag,
+            "Cache-Control": asset.cache_control,
+            "Last-Modified": asset.last_modified,
+            "Accept-Ranges": "bytes",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), asset.etag):
+            return Response(status_code=304, headers=headers)
+
+        body_wanted = request.method != "HEAD"
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and (not if_range or if_range == asset.etag):
+            byte_range = _parse_range(range_header, asset.size)
+            if byte_range == "unsatisfiable":
+                headers["Content-Range"] = f"bytes */{asset.size}"
+                return Response(status_code=416, headers=headers)
+            if byte_range:
+                start, end = byte_range
+                headers["Content-Range"] = f"bytes {start}-{end}/{asset.size}"
+                headers["Content-Length"] = str(end - start + 1)
+                body = asset.read(start, end) if body_wanted else b""
+                return Response(body, status_code=206, headers=headers, media_type=asset.content_type)
+
+        headers["Content-Length"] = str(asset.size)
+        body = asset.read() if body_wanted else b""
+        return Response(body, status_code=200, headers=headers, media_type=asset.content_type)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def _parse_range(header: str, size: int):
+    """Parse a single `bytes=` range. Returns (start, end), None to ignore it, or "unsatisfiable"."""
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None  # multiple or malformed ranges: serve the whole file
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes.
+        length = int(last)
+        if length == 0:
+            return "unsatisfiable"
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return "unsatisfiable"
+    return start, end
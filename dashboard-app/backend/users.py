@@ -1,52 +1,408 @@
 # dashboard-app/backend/users.py
 
+import argparse
+import asyncio
+import csv
+import json
 import os
-import boto3
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 from botocore.exceptions import ClientError
-from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+import metrics
+from cache import MISSING, TTLCache
+from dynamo import DYNAMODB_ENDPOINT_URL, AsyncTable
+from logs import logger
+
+# bcrypt cost factor. Pick it deliberately with `python users.py calibrate` on the
+# target runtime; hashes at any other cost are upgraded on the user's next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 DRY_RUN = os.getenv("DRY_RUN", "false").lower() == "true"
+TABLE_NAME = os.getenv("DASHBOARD_USERS_TABLE", "dashboard-users")
+
+# User records rarely change; cache them per instance to skip a GetItem on every request.
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "300"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+# Cache "no such user" for this long (0 disables negative caching).
+USER_CACHE_NEGATIVE_TTL = float(os.getenv("USER_CACHE_NEGATIVE_TTL", "0"))
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+# bcrypt runs on its own small pool so a burst of logins cannot starve the request threadpool.
+# The C extension releases the GIL, so threads give real parallelism.
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 2)))
+# Verifications allowed to wait for a worker before new ones are refused.
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", str(HASH_WORKERS * 4)))
+_hash_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_slots = threading.BoundedSemaphore(HASH_WORKERS + HASH_QUEUE_LIMIT)
+
+
+class HashPoolBusy(Exception):
+    """Raised when the bcrypt pool's queue is full; callers should answer 503."""
+
+
+# passlib, boto3 and the DRY_RUN user are built on first use, not at import, so Lambda
+# cold starts only pay for what the first request needs (e.g. /healthz needs none).
+_pwd_context = None
+_users_table = None
+_fake_users_db = None
+# Request handlers use this async client; the sync resource above serves the CLI and admin calls.
+users_table_async = AsyncTable(TABLE_NAME)
+# Reentrant: building the DRY_RUN user hashes its password, which initialises passlib under the same lock.
+_init_lock = threading.RLock()
+
+def get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        with _init_lock:
+            if _pwd_context is None:
+                from passlib.context import CryptContext
+                _pwd_context = CryptContext(
+                    schemes=["bcrypt"],
+                    deprecated="auto",
+                    bcrypt__default_rounds=BCRYPT_ROUNDS,
+                    bcrypt__min_rounds=BCRYPT_ROUNDS,
+                    bcrypt__max_rounds=BCRYPT_ROUNDS,
+                )
+    return _pwd_context
+
+def get_users_table():
+    global _users_table
+    if _users_table is None:
+        with _init_lock:
+            if _users_table is None:
+                import boto3
+                dynamodb = boto3.resource(
+                    "dynamodb",
+                    region_name=os.getenv("AWS_REGION", "us-east-1"),
+                    endpoint_url=DYNAMODB_ENDPOINT_URL,
+                )
+                _users_table = dynamodb.Table(TABLE_NAME)
+    return _users_table
+
+def get_fake_users_db():
+    global _fake_users_db
+    if _fake_users_db is None:
+        with _init_lock:
+            if _fake_users_db is None:
+                _fake_users_db = {
+                    "testuser@example.com": {
+                        "email": "testuser@example.com",
+                        "name": "Test User",
+                        "password": hash_password("Passw0rd!")
+                    }
+                }
+    return _fake_users_db
+
+def warm_up():
+    """Build everything lazily initialised above, for when init time is free (EAGER_INIT)."""
+    get_pwd_context()
+    if DRY_RUN:
+        get_fake_users_db()
+    else:
+        users_table_async.warm_up()
 
-fake_users_db = {}
-if DRY_RUN:
-    fake_users_db = {
-        "testuser@example.com": {
-            "email": "testuser@example.com",
-            "name": "Test User",
-            "password": pwd_context.hash("Passw0rd!")
-        }
-    }
-else:
-    TABLE_NAME = os.getenv("DASHBOARD_USERS_TABLE", "dashboard-users")
-    dynamodb = boto3.resource(
-        "dynamodb",
-        region_name=os.getenv("AWS_REGION", "us-east-1")
-    )
-    users_table = dynamodb.Table(TABLE_NAME)
-
-def get_user(email: str):
+async def get_user(email: str):
     key = email.lower()
+    cached = user_cache.get(key)
+    if cached is not MISSING:
+        metrics.inc("user_cache_requests_total", result="hit")
+        return cached
+    metrics.inc("user_cache_requests_total", result="miss")
     if DRY_RUN:
-        return fake_users_db.get(key)
+        user = get_fake_users_db().get(key)
+    else:
+        try:
+            with metrics.timed("dynamodb_call_duration_seconds", operation="GetItem"):
+                resp = await users_table_async.get_item(Key={"email": key})
+        except ClientError as e:
+            # Don't cache: the user may well exist.
+            logger.error("DynamoDB error", extra={"fields": {"operation": "GetItem", "error": e.response['Error']['Message']}})
+            return None
+        user = resp.get("Item")
+    user_cache.set(key, user, ttl=None if user else USER_CACHE_NEGATIVE_TTL)
+    return user
+
+def peek_user(email: str):
+    """Cached user record without any I/O: the record, None if cached as missing, or MISSING."""
+    return user_cache.peek(email.lower())
+
+def token_version(user: dict) -> int:
+    return int(user.get("token_version", 0))
+
+def revoke_tokens(email: str):
+    """Invalidate every token issued to a user by bumping their token_version."""
+    key = email.lower()
+    if DRY_RUN:
+        user = get_fake_users_db().get(key)
+        if user:
+            user["token_version"] = token_version(user) + 1
+        return
     try:
-        resp = users_table.get_item(Key={"email": key})
-        return resp.get("Item")
+        with metrics.timed("dynamodb_call_duration_seconds", operation="UpdateItem"):
+            get_users_table().update_item(
+                Key={"email": key},
+                UpdateExpression="ADD token_version :one",
+                ConditionExpression="attribute_exists(email)",
+                ExpressionAttributeValues={":one": 1},
+            )
     except ClientError as e:
-        print(f"DynamoDB error: {e.response['Error']['Message']}")
-        return None
+        logger.error("Error revoking tokens", extra={"fields": {"operation": "UpdateItem", "error": e.response['Error']['Message']}})
+    finally:
+        invalidate_user(key)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+def invalidate_user(email: str):
+    """Drop a cached user record so the next get_user reads it fresh."""
+    user_cache.invalidate(email.lower())
+
+def verify_and_update(plain_password: str, hashed_password: str):
+    """Verify a password; also return a fresh hash if the stored one uses an outdated cost.
+
+    Returns (valid, new_hash) where new_hash is None unless the hash needs upgrading.
+    """
+    with metrics.timed("bcrypt_verify_duration_seconds"):
+        return get_pwd_context().verify_and_update(plain_password, hashed_password)
+
+async def verify_and_update_async(plain_password: str, hashed_password: str):
+    """verify_and_update on the bcrypt pool. Raises HashPoolBusy instead of queueing without bound."""
+    if not _hash_slots.acquire(blocking=False):
+        metrics.inc("bcrypt_rejected_total")
+        raise HashPoolBusy()
+    future = _hash_pool.submit(verify_and_update, plain_password, hashed_password)
+    # Release on completion, not when the awaiting request goes away.
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return await asyncio.wrap_future(future)
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
-def create_user(email: str, name: str, plain_password: str):
+async def update_password_hash(email: str, old_hash: str, new_hash: str):
+    """Store an upgraded hash, unless the password changed since `old_hash` was read."""
+    key = email.lower()
     if DRY_RUN:
+        user = get_fake_users_db().get(key)
+        if user and user["password"] == old_hash:
+            user["password"] = new_hash
         return
-    item = {"email": email.lower(), "name": name, "password": hash_password(plain_password)}
     try:
-        users_table.put_item(Item=item)
+        with metrics.timed("dynamodb_call_duration_seconds", operation="UpdateItem"):
+            await users_table_async.update_item(
+                Key={"email": key},
+                UpdateExpression="SET password = :new",
+                ConditionExpression="password = :old",
+                ExpressionAttributeValues={":new": new_hash, ":old": old_hash},
+            )
+        metrics.inc("password_rehash_total")
     except ClientError as e:
-        print(f"Error creating user: {e.response['Error']['Message']}")
+        logger.warning("Password rehash skipped", extra={"fields": {"operation": "UpdateItem", "error": e.response['Error']['Message']}})
+    finally:
+        invalidate_user(key)
+
+def calibrate_rounds(budget_ms: float, min_rounds: int = 10, max_rounds: int = 16, samples: int = 3):
+    """Time bcrypt at each cost on this machine and pick the highest within `budget_ms`.
+
+    Returns (rounds, {rounds: median_ms}). Each extra round doubles the cost, so
+    measuring stops at the first cost over budget. If even `min_rounds` is over
+    budget it is still returned (never go weaker than the floor) and a warning is
+    logged; callers can spot this as timings[rounds] > budget_ms.
+    """
+    from passlib.context import CryptContext
+
+    bcrypt = CryptContext(schemes=["bcrypt"]).handler("bcrypt")
+    timings = {}
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        hasher = bcrypt.using(rounds=rounds)
+        runs = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            hasher.hash("calibration-password")
+            runs.append((time.perf_counter() - started) * 1000)
+        timings[rounds] = sorted(runs)[len(runs) // 2]
+        if timings[rounds] > budget_ms:
+            break
+        chosen = rounds
+    if timings[chosen] > budget_ms:
+        logger.warning("bcrypt floor exceeds latency budget", extra={"fields": {
+            "rounds": chosen, "median_ms": round(timings[chosen], 1), "budget_ms": budget_ms,
+        }})
+    return chosen, timings
+
+async def create_user(email: str, name: str, plain_password: str):
+    if DRY_RUN:
+        return
+    password = await asyncio.wrap_future(_hash_pool.submit(hash_password, plain_password))
+    item = {"email": email.lower(), "name": name, "password": password}
+    try:
+        with metrics.timed("dynamodb_call_duration_seconds", operation="PutItem"):
+            await users_table_async.put_item(Item=item)
+    except ClientError as e:
+        logger.error("Error creating user", extra={"fields": {"operation": "PutItem", "error": e.response['Error']['Message']}})
+    finally:
+        # After the write, so a concurrent get_user cannot re-cache the old record.
+        invalidate_user(email)
+
+def _file_format(path: str, fmt: str = None) -> str:
+    if fmt:
+        return fmt
+    return "jsonl" if path.endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+def read_user_rows(path: str, fmt: str = None):
+    """Yield dicts from a CSV (with a header row) or JSONL file; "-" reads stdin."""
+    f = sys.stdin if path == "-" else open(path, newline="")
+    try:
+        if _file_format(path, fmt) == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def _hash_or_keep(row: dict) -> str:
+    # Runs in a worker process. Rows from `export` already carry a hash.
+    return row.get("password_hash") or hash_password(row["password"])
+
+def _existing_users(emails: list) -> dict:
+    """Fetch current records for `emails` with BatchGetItem (100 keys per call), keyed by email."""
+    client = get_users_table().meta.client
+    found = {}
+    for start in range(0, len(emails), 100):
+        request = {TABLE_NAME: {"Keys": [{"email": e} for e in emails[start:start + 100]], "ConsistentRead": True}}
+        delay = 0.05
+        while request:
+            with metrics.timed("dynamodb_call_duration_seconds", operation="BatchGetItem"):
+                resp = client.batch_get_item(RequestItems=request)
+            for user in resp.get("Responses", {}).get(TABLE_NAME, []):
+                found[user["email"]] = user
+            request = resp.get("UnprocessedKeys") or None
+            if request:
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
+    return found
+
+def import_users(path: str, fmt: str = None, workers: int = None) -> dict:
+    """Create or overwrite users in bulk from CSV/JSONL with email, name and password (or password_hash).
+
+    Passwords are hashed across a process pool and the items streamed into a
+    batch_writer as hashes complete. batch_writer sends 25 items per
+    BatchWriteItem and re-queues any UnprocessedItems, so throttled writes are
+    retried rather than lost. Returns {"imported", "skipped", "seconds"}.
+
+    Users that already exist keep every attribute the file does not set, and
+    their token_version never goes down, so an import cannot revive tokens
+    that were revoked. Changes made to those users while the import runs can
+    still be overwritten.
+    """
+    started = time.perf_counter()
+    rows, skipped, seen = [], 0, set()
+    for row in read_user_rows(path, fmt):
+        email = (row.get("email") or "").strip().lower()
+        if not email or not (row.get("password") or row.get("password_hash")) or email in seen:
+            skipped += 1
+            continue
+        seen.add(email)
+        rows.append({**row, "email": email})
+
+    imported = 0
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        hashes = pool.map(_hash_or_keep, rows, chunksize=max(1, len(rows) // (workers * 4)))
+        if DRY_RUN:
+            imported = sum(1 for _ in hashes)
+        else:
+            # Looked up while the pool hashes, so the reads overlap the CPU-bound work.
+            existing = _existing_users([row["email"] for row in rows])
+            with get_users_table().batch_writer(overwrite_by_pkeys=["email"]) as batch:
+                for row, password in zip(rows, hashes):
+                    current = existing.get(row["email"], {})
+                    item = {**current, "email": row["email"], "password": password,
+                            "name": row.get("name") or current.get("name") or row["email"]}
+                    if row.get("token_version") not in (None, ""):
+                        item["token_version"] = max(int(row["token_version"]), token_version(current))
+                    batch.put_item(Item=item)
+                    imported += 1
+    return {"imported": imported, "skipped": skipped, "seconds": time.perf_counter() - started}
+
+def export_users(path: str, fmt: str = None) -> int:
+    """Write every user (email, name, password_hash, token_version) to CSV/JSONL; "-" writes stdout.
+
+    The output can be fed back to import_users unchanged; hashes are kept as-is.
+    """
+    fields = ["email", "name", "password_hash", "token_version"]
+    if DRY_RUN:
+        pages = [list(get_fake_users_db().values())]
+    else:
+        pages = _scan_users()
+    f = sys.stdout if path == "-" else open(path, "w", newline="")
+    count = 0
+    try:
+        writer = csv.DictWriter(f, fieldnames=fields) if _file_format(path, fmt) == "csv" else None
+        if writer:
+            writer.writeheader()
+        for page in pages:
+            for user in page:
+                row = {"email": user["email"], "name": user.get("name", ""),
+                       "password_hash": user["password"], "token_version": token_version(user)}
+                if writer:
+                    writer.writerow(row)
+                else:
+                    f.write(json.dumps(row) + "\n")
+                count += 1
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return count
+
+def _scan_users():
+    """Yield the users table one Scan page at a time."""
+    kwargs = {"ProjectionExpression": "email, #n, password, token_version",
+              "ExpressionAttributeNames": {"#n": "name"}}
+    while True:
+        with metrics.timed("dynamodb_call_duration_seconds", operation="Scan"):
+            resp = get_users_table().scan(**kwargs)
+        yield resp.get("Items", [])
+        if "LastEvaluatedKey" not in resp:
+            return
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard user administration")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cal = sub.add_parser("calibrate", help="Pick BCRYPT_ROUNDS for a login latency budget on this machine")
+    cal.add_argument("--budget-ms", type=float, default=250.0)
+    cal.add_argument("--samples", type=int, default=3)
+    imp = sub.add_parser("import", help="Bulk create/overwrite users from CSV or JSONL")
+    imp.add_argument("path", help='File with email,name,password (or password_hash) columns; "-" for stdin')
+    imp.add_argument("--format", choices=["csv", "jsonl"], help="Default: from the file extension")
+    imp.add_argument("--workers", type=int, default=None, help="Hashing processes (default: CPU count)")
+    exp = sub.add_parser("export", help="Dump all users, with password hashes, to CSV or JSONL")
+    exp.add_argument("path", help='Output file; "-" for stdout')
+    exp.add_argument("--format", choices=["csv", "jsonl"], help="Default: from the file extension")
+    args = parser.parse_args()
+
+    if args.command == "calibrate":
+        rounds, timings = calibrate_rounds(args.budget_ms, samples=args.samples)
+        for cost, ms in timings.items():
+            marker = "  <- chosen" if cost == rounds else ""
+            print(f"rounds={cost:<3} {ms:8.1f} ms{marker}")
+        print(f"\nBCRYPT_ROUNDS={rounds}  (current: {BCRYPT_ROUNDS}, budget: {args.budget_ms:.0f} ms)")
+        if timings[rounds] > args.budget_ms:
+            print(f"⚠️ Even the minimum of {rounds} rounds takes {timings[rounds]:.0f} ms, over the budget; "
+                  "raise --budget-ms or use a faster machine class.")
+    elif args.command == "import":
+        result = import_users(args.path, args.format, args.workers)
+        rate = result["imported"] / result["seconds"] if result["seconds"] else 0
+        print(f"Imported {result['imported']} users ({result['skipped']} skipped) "
+              f"in {result['seconds']:.1f}s, {rate:.0f}/s{' [DRY_RUN: nothing written]' if DRY_RUN else ''}")
+    elif args.command == "export":
+        count = export_users(args.path, args.format)
+        print(f"Exported {count} users", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,163 @@
 import click
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
 import os
+import re
+import signal
 import boto3
 import time
 import subprocess
 import socket
+import threading
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+BUILD_DIR = "dashboard-app/build"
+BACKEND_DIR = "dashboard-app/backend"
+BACKEND_PORT = 8000
+BACKEND_URL = f"http://127.0.0.1:{BACKEND_PORT}"
+BACKEND_HEALTH_URL = f"{BACKEND_URL}/healthz"
+BACKEND_PID_FILE = ".backend.pid"
+BACKEND_START_TIMEOUT = 30
+BACKEND_STOP_TIMEOUT = 10
+UPLOAD_WORKERS = 16
+UPLOAD_RETRIES = 3
+# Each worker already owns one file, so keep boto3 from spawning its own threads per upload.
+UPLOAD_TRANSFER_CONFIG = TransferConfig(use_threads=False)
+CACHE_FILE = ".dashboard-agent-cache.json"
+# CloudFront charges per path and allows 15 concurrent wildcard paths; collapse beyond this.
+MAX_INVALIDATION_PATHS = 15
+# CRA fingerprints build output as name.<hex>[.chunk].ext, e.g. static/js/main.1a2b3c4d.js
+HASHED_ASSET_RE = re.compile(r"\.[0-9a-f]{8,}(\.chunk)?\.[a-z0-9]+(\.map|\.LICENSE\.txt)?$")
+
+# Text assets are stored gzip-encoded; every browser accepts gzip and S3 cannot negotiate encodings.
+COMPRESSIBLE_TYPES = {
+    "application/javascript", "application/json", "application/manifest+json",
+    "application/xml", "image/svg+xml", "text/css", "text/html", "text/javascript",
+    "text/plain", "text/xml",
+}
+# Types mimetypes does not know; source maps are JSON and the largest text assets in a build.
+CONTENT_TYPE_OVERRIDES = {".map": "application/json"}
+GZIP_MIN_SIZE = 1024
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_HTML = "no-cache"
+CACHE_DEFAULT = "public, max-age=300"
+# Bump when asset headers change: the next refresh then re-uploads every file, even unchanged ones.
+# 1 was the headerless uploads before versioning (never stored); 3 added JSON + gzip for .map files.
+PUBLISH_VERSION = 3
+
+class StageError(Exception):
+    """A pipeline stage failed in an expected way; the message is shown in the summary."""
+
+class Task:
+    """One node of the refresh pipeline: a named callable that runs once its deps succeed."""
+
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+_stage = threading.local()
+_echo_lock = threading.Lock()
+_procs_lock = threading.Lock()
+_running_procs = set()
+_cancelled = threading.Event()
+
+def say(message=""):
+    """Echo a line prefixed with the current pipeline stage, without interleaving threads."""
+    name = getattr(_stage, "name", None)
+    with _echo_lock:
+        click.echo(f"[{name}] {message}" if name else message)
+
+def run_streamed(cmd, cwd=None):
+    """Run a command, echoing its combined output line by line under the stage prefix.
+
+    The command gets its own process group so a cancel can stop everything it spawned.
+    """
+    proc = subprocess.Popen(
+        cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, bufsize=1, start_new_session=True
+    )
+    with _procs_lock:
+        _running_procs.add(proc)
+    try:
+        for line in proc.stdout:
+            say(line.rstrip())
+        returncode = proc.wait()
+    finally:
+        with _procs_lock:
+            _running_procs.discard(proc)
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+def _cancel_running():
+    """Fail fast: stop subprocesses still running in other stages."""
+    _cancelled.set()
+    with _procs_lock:
+        for proc in _running_procs:
+            try:
+                os.killpg(proc.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+def _run_task(task):
+    _stage.name = task.name
+    started = time.perf_counter()
+    try:
+        task.fn()
+        return "ok", time.perf_counter() - started, None
+    except Exception as e:
+        status = "cancelled" if _cancelled.is_set() else "failed"
+        return status, time.perf_counter() - started, e
+    finally:
+        _stage.name = None
+
+def run_pipeline(tasks):
+    """Run tasks concurrently as their dependencies complete.
+
+    The first failure cancels the rest: running subprocesses are terminated
+    and tasks not yet started are skipped. Prints a per-stage summary and
+    returns True when every task succeeded.
+    """
+    _cancelled.clear()
+    pending = {task.name: task for task in tasks}
+    results = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+        while pending or running:
+            if not _cancelled.is_set():
+                for name, task in list(pending.items()):
+                    if all(results.get(dep, ("",))[0] == "ok" for dep in task.deps):
+                        running[pool.submit(_run_task, task)] = task
+                        del pending[name]
+            if not running:
+                break
+            try:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+            except KeyboardInterrupt:
+                # Stages run in their own process groups, so Ctrl-C does not reach them.
+                _cancel_running()
+                raise
+            for future in done:
+                task = running.pop(future)
+                results[task.name] = future.result()
+                if results[task.name][0] == "failed":
+                    _cancel_running()
+    for name in pending:
+        results[name] = ("skipped", 0.0, None)
+
+    icons = {"ok": "✅", "failed": "❌", "cancelled": "🛑", "skipped": "⏭️"}
+    say("📋 Stage summary:")
+    for task in tasks:
+        status, seconds, error = results[task.name]
+        detail = f"  {error}" if status == "failed" else ""
+        say(f"  {icons[status]} {task.name:<16} {status:<9} {seconds:6.1f}s{detail}")
+    return all(status == "ok" for status, _, _ in results.values())
 
 @click.group()
 def cli():
@@ -15,91 +169,427 @@ def is_port_in_use(port):
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         return s.connect_ex(('localhost', port)) == 0
 
+def read_backend_pid():
+    """PID of the backend we started, or None if there is none or it has exited."""
+    try:
+        with open(BACKEND_PID_FILE) as f:
+            pid = int(f.read().strip())
+        os.kill(pid, 0)
+        return pid
+    except (OSError, ValueError):
+        return None
+
+def backend_is_healthy():
+    try:
+        with urllib.request.urlopen(BACKEND_HEALTH_URL, timeout=1) as resp:
+            return resp.status == 200
+    except OSError:
+        return False
+
+def wait_until_ready(proc, timeout=BACKEND_START_TIMEOUT):
+    """Poll the health endpoint with backoff. False if the process exits or time runs out."""
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            return False
+        if backend_is_healthy():
+            return True
+        time.sleep(delay)
+        delay = min(delay * 1.5, 1.0)
+    return False
+
+def wait_for_exit(pid, timeout=BACKEND_STOP_TIMEOUT):
+    """Wait until `pid` is gone. Returns False if it is still alive after `timeout`."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            # Reap it if it is our own child, otherwise a zombie would look alive.
+            os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            pass
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
 def start_backend():
-    """Start FastAPI backend."""
-    if is_port_in_use(8000):
-        click.echo("✅ Backend already running at http://127.0.0.1:8000")
-    else:
-        click.echo("🔄 Starting backend server...")
-        subprocess.Popen(
-            ["uvicorn", "main:app", "--reload"],
-            cwd="dashboard-app/backend"
-        )
-        time.sleep(2)
-        click.echo("✅ Backend started at http://127.0.0.1:8000")
+    """Start FastAPI backend and wait until it answers health checks."""
+    if is_port_in_use(BACKEND_PORT):
+        say(f"✅ Backend already running at {BACKEND_URL}")
+        return
+    say("🔄 Starting backend server...")
+    started = time.perf_counter()
+    # Own session: the server outlives this CLI and can be stopped as a group (reloader + worker).
+    proc = subprocess.Popen(
+        ["uvicorn", "main:app", "--reload", "--port", str(BACKEND_PORT)],
+        cwd=BACKEND_DIR,
+        start_new_session=True
+    )
+    with open(BACKEND_PID_FILE, "w") as f:
+        f.write(str(proc.pid))
+    if not wait_until_ready(proc):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+        os.remove(BACKEND_PID_FILE)
+        raise StageError(f"Backend did not become healthy within {BACKEND_START_TIMEOUT}s")
+    say(f"✅ Backend started at {BACKEND_URL} in {time.perf_counter() - started:.1f}s")
+
+def is_our_backend(pid):
+    """True if `pid` is still the uvicorn process start_backend launched, not a recycled PID."""
+    try:
+        command = subprocess.run(["ps", "-o", "command=", "-p", str(pid)],
+                                 capture_output=True, text=True, check=False).stdout
+    except OSError:
+        return False
+    return "uvicorn" in command and "main:app" in command
+
+def remove_backend_pid_file():
+    try:
+        os.remove(BACKEND_PID_FILE)
+    except FileNotFoundError:
+        pass
 
 def stop_backend():
-    """Stop FastAPI backend."""
-    if is_port_in_use(8000):
-        click.echo("🛑 Stopping backend server...")
-        subprocess.run(["pkill", "-f", "uvicorn"])
-        time.sleep(1)
-        click.echo("✅ Backend stopped.")
-    else:
-        click.echo("ℹ️ Backend was not running.")
+    """Stop FastAPI backend by PID, escalating to SIGKILL after a bounded wait."""
+    pid = read_backend_pid()
+    if pid is not None and not is_our_backend(pid):
+        say(f"⚠️ PID {pid} from {BACKEND_PID_FILE} is no longer our backend; not signalling it.")
+        pid = None
+    if pid is None:
+        if is_port_in_use(BACKEND_PORT):
+            say(f"⚠️ Port {BACKEND_PORT} is in use by a server this CLI did not start; leaving it alone.")
+        else:
+            say("ℹ️ Backend was not running.")
+        remove_backend_pid_file()
+        return
+    say("🛑 Stopping backend server...")
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        # Exited between the check and the signal.
+        remove_backend_pid_file()
+        say("✅ Backend stopped.")
+        return
+    if not wait_for_exit(pid):
+        say(f"⚠️ Backend ignored SIGTERM for {BACKEND_STOP_TIMEOUT}s; killing it.")
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        wait_for_exit(pid)
+    remove_backend_pid_file()
+    say("✅ Backend stopped.")
 
 @cli.command()
-def refresh():
-    """Rebuild frontend, redeploy backend, invalidate CloudFront cache."""
+def stop():
+    """Stop the local backend server started by `refresh`."""
+    stop_backend()
+
+@cli.command()
+@click.option("--workers", default=UPLOAD_WORKERS, show_default=True,
+              help="Number of parallel S3 upload threads.")
+@click.option("--full", is_flag=True, help="Re-upload every file instead of only changed ones.")
+@click.option("--prune", is_flag=True, help="Delete hashed assets under static/ that are no longer in the build.")
+def refresh(workers, full, prune):
+    """Rebuild frontend, redeploy backend, invalidate CloudFront cache.
+
+    The frontend (build → S3 → CloudFront) and backend (Lambda deploy →
+    local restart) pipelines run concurrently.
+    """
     domain_sub = "dashboard.danieldow.com"
-    click.echo("🔄 Refreshing Dashboard deployment...")
+    say("🔄 Refreshing Dashboard deployment...")
+    started = time.perf_counter()
+    state = {}
 
-    # Rebuild frontend
-    click.echo("🔨 Rebuilding React app...")
+    def upload():
+        state["sync"] = deploy_to_s3(domain_sub, workers=workers, full=full, prune=prune)
+        if state["sync"] is None:
+            raise StageError("S3 upload failed")
+
+    tasks = [
+        Task("build", build_frontend),
+        Task("upload", upload, deps=["build"]),
+        Task("invalidate", lambda: invalidate_cloudfront(domain_sub, state["sync"]), deps=["upload"]),
+        Task("deploy-backend", deploy_backend),
+        # uvicorn --reload watches the backend dir, which packaging rewrites; start it afterwards.
+        Task("start-backend", start_backend, deps=["deploy-backend"]),
+    ]
+    ok = run_pipeline(tasks)
+    elapsed = time.perf_counter() - started
+    if ok:
+        say(f"🎉 Dashboard refreshed and backend restarted in {elapsed:.1f}s.")
+    else:
+        say(f"❌ Refresh failed after {elapsed:.1f}s.")
+        raise SystemExit(1)
+
+def build_frontend():
+    """Build the React app into dashboard-app/build."""
+    say("🔨 Rebuilding React app...")
     try:
-        subprocess.run(["npx", "react-scripts", "build"], cwd="dashboard-app", check=True)
-        click.echo("✅ React app rebuilt.")
-    except subprocess.CalledProcessError:
-        click.echo("❌ React build failed.")
-        return
+        run_streamed(["npx", "react-scripts", "build"], cwd="dashboard-app")
+    except subprocess.CalledProcessError as e:
+        raise StageError(f"React build failed (exit {e.returncode})")
+    say("✅ React app rebuilt.")
 
-    # Upload to S3
-    deploy_to_s3(domain_sub)
+def load_cache():
+    """Read the local CLI cache (distribution IDs etc.); empty if missing or unreadable."""
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-    # Invalidate CloudFront
-    cf_client = boto3.client('cloudfront')
-    click.echo("♻️  Invalidating CloudFront cache...")
+def save_cache(cache):
+    with open(CACHE_FILE, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+def find_distribution_id(cf_client, domain, use_cache=True):
+    """Return the ID of the distribution aliased to `domain`, caching the paginated lookup."""
+    cache = load_cache()
+    cached = cache.get("cloudfront", {}).get(domain)
+    if use_cache and cached:
+        return cached
     paginator = cf_client.get_paginator('list_distributions')
     for page in paginator.paginate():
         for dist in page['DistributionList'].get('Items', []):
             aliases = dist['Aliases']['Items'] if dist['Aliases']['Quantity'] > 0 else []
-            if domain_sub in aliases:
-                cf_id = dist['Id']
-                cf_client.create_invalidation(
-                    DistributionId=cf_id,
-                    InvalidationBatch={
-                        'Paths': {'Quantity': 1, 'Items': ['/*']},
-                        'CallerReference': str(time.time())
-                    }
-                )
-                click.echo("✅ CloudFront cache invalidated.")
-                break
+            if domain in aliases:
+                cache.setdefault("cloudfront", {})[domain] = dist['Id']
+                save_cache(cache)
+                return dist['Id']
+    return None
 
-    # Deploy backend
-    deploy_backend()
+def collapse_paths(paths, limit=MAX_INVALIDATION_PATHS):
+    """Fold paths into directory wildcards, deepest first, until at most `limit` remain."""
+    paths = set(paths)
+    depth = max((p.count("/") for p in paths), default=0)
+    while len(paths) > limit and depth > 1:
+        depth -= 1
+        collapsed = set()
+        for p in paths:
+            parts = p.split("/")
+            collapsed.add("/".join(parts[:depth + 1]) + "/*" if len(parts) > depth + 1 else p)
+        paths = collapsed
+    return sorted(paths) if len(paths) <= limit else ["/*"]
 
-    # Restart backend locally (dev use)
-    start_backend()
-    click.echo("🎉 Dashboard refreshed and backend restarted.")
+def invalidation_paths(sync):
+    """CloudFront paths affected by a sync. Fingerprinted assets are never cached stale, so skip them."""
+    paths = set()
+    for key in sync["uploaded"] + sync["deleted"]:
+        if is_hashed_asset(key):
+            continue
+        paths.add("/" + key)
+        if key == "index.html":
+            paths.add("/")
+    return collapse_paths(paths)
+
+def invalidate_cloudfront(domain, sync):
+    """Invalidate only the paths the sync changed on the distribution serving `domain`."""
+    paths = invalidation_paths(sync)
+    if not paths:
+        say("ℹ️ No cacheable files changed; skipping CloudFront invalidation.")
+        return
+    cf_client = boto3.client('cloudfront')
+    say(f"♻️  Invalidating CloudFront cache: {', '.join(paths)}")
+    for use_cache in (True, False):
+        cf_id = find_distribution_id(cf_client, domain, use_cache=use_cache)
+        if not cf_id:
+            say(f"⚠️ No CloudFront distribution found for {domain}.")
+            return
+        try:
+            cf_client.create_invalidation(
+                DistributionId=cf_id,
+                InvalidationBatch={
+                    'Paths': {'Quantity': len(paths), 'Items': paths},
+                    'CallerReference': str(time.time())
+                }
+            )
+        except cf_client.exceptions.NoSuchDistribution:
+            # Cached ID is gone (distribution recreated); rescan once.
+            continue
+        say("✅ CloudFront cache invalidated.")
+        return
+    say(f"⚠️ Distribution for {domain} disappeared during lookup.")
 
 def deploy_backend():
     """Deploy backend to AWS Lambda & API Gateway"""
-    click.echo("🚀 Deploying backend to Lambda & API Gateway...")
+    say("🚀 Deploying backend to Lambda & API Gateway...")
     try:
-        subprocess.run(["deploy/deploy_backend.sh"], check=True)
-        click.echo("✅ Backend deployed.")
+        run_streamed(["deploy/deploy_backend.sh"])
     except subprocess.CalledProcessError as e:
-        click.echo(f"❌ Backend deployment failed: {e}")
+        raise StageError(f"Backend deployment failed (exit {e.returncode})")
+    say("✅ Backend deployed.")
+
+def collect_build_files(build_dir=BUILD_DIR):
+    """Return (local path, S3 key) pairs for every file in the build directory."""
+    files = []
+    for root, _, names in os.walk(build_dir):
+        for name in names:
+            full_path = os.path.join(root, name)
+            relative_path = os.path.relpath(full_path, build_dir)
+            files.append((full_path, relative_path.replace("\\", "/")))
+    return files
+
+def is_hashed_asset(key):
+    """True for content-fingerprinted build output that never changes under the same name."""
+    return key.startswith("static/") and bool(HASHED_ASSET_RE.search(key))
+
+def s3_etag(source, config=UPLOAD_TRANSFER_CONFIG):
+    """Compute the ETag S3 assigns to `source` (a path or bytes) when uploaded with `config`.
+
+    Single-part uploads get the plain MD5; multipart uploads get the MD5 of
+    the concatenated part digests suffixed with the part count.
+    """
+    f = io.BytesIO(source) if isinstance(source, bytes) else open(source, "rb")
+    with f:
+        size = f.seek(0, io.SEEK_END)
+        f.seek(0)
+        if size < config.multipart_threshold:
+            return hashlib.md5(f.read()).hexdigest()
+        digests = []
+        for chunk in iter(lambda: f.read(config.multipart_chunksize), b""):
+            digests.append(hashlib.md5(chunk).digest())
+    return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+
+def asset_headers(key):
+    """Content-Type and Cache-Control for a build file."""
+    content_type = (CONTENT_TYPE_OVERRIDES.get(os.path.splitext(key)[1])
+                    or mimetypes.guess_type(key)[0] or "application/octet-stream")
+    if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+        content_type += "; charset=utf-8"
+    if is_hashed_asset(key):
+        cache_control = CACHE_IMMUTABLE
+    elif key.endswith(".html"):
+        cache_control = CACHE_HTML
+    else:
+        cache_control = CACHE_DEFAULT
+    return {'ContentType': content_type, 'CacheControl': cache_control}
 
-def deploy_to_s3(bucket_name):
-    """Upload build to S3 bucket."""
-    s3 = boto3.client('s3')
-    click.echo("🚀 Uploading React build to S3...")
+def prepare_asset(full_path, key):
+    """Decide what bytes and headers to publish for one build file.
+
+    Returns a dict with the upload `source` (the path, or gzip bytes for
+    compressible text), the ExtraArgs, the resulting S3 ETag and both sizes.
+    """
+    extra = asset_headers(key)
+    raw_size = os.path.getsize(full_path)
+    source = full_path
+    if extra['ContentType'].split(";")[0] in COMPRESSIBLE_TYPES and raw_size >= GZIP_MIN_SIZE:
+        with open(full_path, "rb") as f:
+            # mtime=0 keeps the output (and so the ETag) stable across builds.
+            compressed = gzip.compress(f.read(), compresslevel=9, mtime=0)
+        if len(compressed) < raw_size:
+            source = compressed
+            extra['ContentEncoding'] = "gzip"
+    return {
+        "key": key,
+        "source": source,
+        "extra": extra,
+        "etag": s3_etag(source),
+        "raw_size": raw_size,
+        "size": len(source) if isinstance(source, bytes) else raw_size,
+    }
+
+def list_remote_etags(s3, bucket_name):
+    """Return {key: etag} for every object in the bucket, in one paginated listing."""
+    remote = {}
+    paginator = s3.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket_name):
+        for obj in page.get('Contents', []):
+            remote[obj['Key']] = obj['ETag'].strip('"')
+    return remote
+
+def plan_sync(assets, remote):
+    """Split prepared assets into (changed, unchanged) and find stale hashed assets in the bucket."""
+    changed, unchanged = [], []
+    for asset in assets:
+        (unchanged if remote.get(asset["key"]) == asset["etag"] else changed).append(asset)
+    local_keys = {asset["key"] for asset in assets}
+    stale = sorted(key for key in remote if key not in local_keys and is_hashed_asset(key))
+    return changed, unchanged, stale
+
+def delete_keys(s3, bucket_name, keys):
+    """Delete keys in batches of 1000 (the DeleteObjects limit). Returns keys that failed."""
+    failed = []
+    for i in range(0, len(keys), 1000):
+        batch = keys[i:i + 1000]
+        resp = s3.delete_objects(
+            Bucket=bucket_name,
+            Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+        )
+        failed.extend(err['Key'] for err in resp.get('Errors', []))
+    return failed
+
+def upload_one(s3, bucket_name, asset, retries=UPLOAD_RETRIES):
+    """Upload a single prepared asset, retrying with backoff. Returns the number of attempts used."""
+    for attempt in range(1, retries + 1):
+        try:
+            if isinstance(asset["source"], bytes):
+                s3.upload_fileobj(
+                    io.BytesIO(asset["source"]),
+                    bucket_name,
+                    asset["key"],
+                    ExtraArgs=asset["extra"],
+                    Config=UPLOAD_TRANSFER_CONFIG
+                )
+            else:
+                s3.upload_file(
+                    Filename=asset["source"],
+                    Bucket=bucket_name,
+                    Key=asset["key"],
+                    ExtraArgs=asset["extra"],
+                    Config=UPLOAD_TRANSFER_CONFIG
+                )
+            return attempt
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(0.5 * 2 ** (attempt - 1))
+
+def upload_files(s3, bucket_name, assets, workers=UPLOAD_WORKERS):
+    """Upload assets concurrently through one shared client. Returns {key: error} for failures."""
+    failures = {}
+    total = len(assets)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(upload_one, s3, bucket_name, asset): asset["key"]
+            for asset in assets
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            key = futures[future]
+            try:
+                attempts = future.result()
+            except Exception as e:
+                failures[key] = e
+                say(f"  [{done}/{total}] ❌ {key}: {e}")
+                continue
+            retried = f" (after {attempts} attempts)" if attempts > 1 else ""
+            say(f"  [{done}/{total}] {key}{retried}")
+    return failures
+
+def make_s3_client(workers=UPLOAD_WORKERS):
+    """S3 client whose connection pool is large enough for every upload thread."""
+    return boto3.client('s3', config=Config(max_pool_connections=max(10, workers)))
+
+def deploy_to_s3(bucket_name, workers=UPLOAD_WORKERS, full=False, prune=False):
+    """Sync the build to an S3 bucket, uploading only files whose content changed.
+
+    Returns {"uploaded": [...], "unchanged": [...], "deleted": [...]} (lists of
+    S3 keys), or None if any upload failed.
+    """
+    s3 = make_s3_client(workers)
+    say("🚀 Uploading React build to S3...")
     try:
         s3.head_bucket(Bucket=bucket_name)
-        click.echo(f"🪣 Bucket {bucket_name} exists.")
+        say(f"🪣 Bucket {bucket_name} exists.")
     except:
-        click.echo(f"🪣 Creating bucket: {bucket_name}")
+        say(f"🪣 Creating bucket: {bucket_name}")
         s3.create_bucket(Bucket=bucket_name)
 
     s3.put_bucket_website(
@@ -110,19 +600,47 @@ def deploy_to_s3(bucket_name):
         }
     )
 
-    build_dir = "dashboard-app/build"
-    for root, _, files in os.walk(build_dir):
-        for file in files:
-            full_path = os.path.join(root, file)
-            relative_path = os.path.relpath(full_path, build_dir)
-            content_type = "text/html" if file.endswith(".html") else "application/octet-stream"
-            s3.upload_file(
-                Filename=full_path,
-                Bucket=bucket_name,
-                Key=relative_path.replace("\\", "/"),
-                ExtraArgs={'ContentType': content_type}
-            )
-    click.echo("✅ React app deployed to S3.")
+    assets = [prepare_asset(full_path, key) for full_path, key in collect_build_files()]
+    raw_bytes = sum(asset["raw_size"] for asset in assets)
+    sent_bytes = sum(asset["size"] for asset in assets)
+    say(f"🗜️  Build is {raw_bytes / 1024:.0f} KB, {sent_bytes / 1024:.0f} KB after compression.")
+
+    cache = load_cache()
+    if cache.get("publish_version", {}).get(bucket_name) != PUBLISH_VERSION:
+        say("ℹ️ Asset headers changed since the last deploy; re-publishing everything.")
+        full = True
+    if full:
+        changed, unchanged, stale = assets, [], []
+    else:
+        changed, unchanged, stale = plan_sync(assets, list_remote_etags(s3, bucket_name))
+        say(f"🔍 {len(changed)} changed, {len(unchanged)} unchanged, {len(stale)} stale.")
+
+    started = time.perf_counter()
+    failures = upload_files(s3, bucket_name, changed, workers=workers)
+    elapsed = time.perf_counter() - started
+    if failures:
+        say(f"❌ {len(failures)} of {len(changed)} file(s) failed to upload:")
+        for key, error in sorted(failures.items()):
+            say(f"   {key}: {error}")
+        return None
+    say(f"✅ React app deployed to S3 ({len(changed)} files in {elapsed:.1f}s, {workers} workers).")
+    cache = load_cache()
+    cache.setdefault("publish_version", {})[bucket_name] = PUBLISH_VERSION
+    save_cache(cache)
+
+    deleted = []
+    if prune and stale:
+        failed = delete_keys(s3, bucket_name, stale)
+        deleted = [key for key in stale if key not in failed]
+        say(f"🧹 Pruned {len(deleted)} stale asset(s).")
+        if failed:
+            say(f"⚠️ Could not delete {len(failed)} object(s): {', '.join(failed)}")
+
+    return {
+        "uploaded": [asset["key"] for asset in changed],
+        "unchanged": [asset["key"] for asset in unchanged],
+        "deleted": deleted,
+    }
 
 if __name__ == "__main__":
     cli()
@@ -21,6 +21,10 @@ cp dashboard-app/backend/*.py "$BUILD_DIR/"
 cp dashboard-app/backend/requirements-lambda.txt "$BUILD_DIR/"
 cp -r dashboard-app/backend/public "$BUILD_DIR/"
 
+# Responsive WebP/AVIF derivatives + <picture> markup; fails the package without Pillow
+echo "🖼️ Building image derivatives…"
+python3 scripts/build-images.py --public "$BUILD_DIR/public"
+
 if [ "$DRY_RUN" = "false" ]; then
   echo "🐳 Installing Python dependencies…"
   SAM_IMAGE="public.ecr.aws/sam/build-python3.12"
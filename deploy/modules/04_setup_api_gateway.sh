@@ -67,4 +67,24 @@ else
     PARENT_ID=$(aws apigateway get-resources --rest-api-id "$REST_API_ID" --query 'items[0].id' --output text --region us-east-1)
   fi
 fi
-export PARENT_ID
\ No newline at end of file
+export PARENT_ID
+
+# Mangum returns images base64-encoded; a REST API only decodes them for binary media types,
+# otherwise /public images arrive as base64 text. Takes effect with the step 7 deployment.
+if [ "${DRY_RUN:-false}" = "true" ]; then
+  echo "🧪 DRY RUN: Skipping: aws apigateway update-rest-api --rest-api-id $REST_API_ID (binaryMediaTypes image/*)"
+else
+  BINARY_MEDIA_TYPES=$(aws apigateway get-rest-api --rest-api-id "$REST_API_ID" --query 'binaryMediaTypes' --output text --region us-east-1)
+  case "$BINARY_MEDIA_TYPES" in
+    *"image/*"*)
+      echo "✅ Binary media type image/* already enabled"
+      ;;
+    *)
+      aws apigateway update-rest-api \
+        --rest-api-id "$REST_API_ID" \
+        --patch-operations 'op=add,path=/binaryMediaTypes/image~1*' \
+        --region us-east-1 >/dev/null
+      echo "🖼️ Enabled binary media type image/*"
+      ;;
+  esac
+fi
\ No newline at end of file
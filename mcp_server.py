@@ -1,32 +1,62 @@
 """MCP server for Daniel's dashboard tools — manuscript uploads and chat history."""
 
+import asyncio
 import gzip
 import io
+import itertools
 import json
 import os
 import sys
 import logging
 import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from pathlib import Path
 
 import boto3
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
 from mcp.server.fastmcp import FastMCP
 
 logging.basicConfig(level=logging.INFO, stream=sys.stderr)
 logger = logging.getLogger(__name__)
 
-mcp = FastMCP("dashboard-tools")
+
+@asynccontextmanager
+async def _lifespan(server):
+    try:
+        yield
+    finally:
+        # Stdio closed: run the cleanup passes still waiting out their debounce.
+        await cleanup_scheduler.drain()
+
+
+mcp = FastMCP("dashboard-tools", lifespan=_lifespan)
 
 REGION = "us-east-1"
 S3_BUCKET = "diagnosingelijah.com"
 CHAT_TABLE = "dashboard-chat-history"
 
 s3 = boto3.client("s3", region_name=REGION)
-dynamodb = boto3.resource("dynamodb", region_name=REGION)
-chat_table = dynamodb.Table(CHAT_TABLE)
+_thread_local = threading.local()
+
+
+def _chat_table():
+    """This thread's chat table resource.
+
+    Sync tools run on the event loop thread, while cleanup passes and
+    save_chat's writes run on worker threads. boto3 clients are thread-safe
+    but resources are not, so each thread gets its own, built from its own
+    session.
+    """
+    table = getattr(_thread_local, "chat_table", None)
+    if table is None:
+        table = boto3.session.Session().resource("dynamodb", region_name=REGION).Table(CHAT_TABLE)
+        _thread_local.chat_table = table
+    return table
 
 
 class DecimalEncoder(json.JSONEncoder):
@@ -253,94 +283,449 @@ def download_manuscript(s3_key: str, local_path: str) -> str:
 # ── Chat History Tools ───────────────────────────────────────────────
 
 MAX_CHAT_DAYS = 14
+# Chat text is stored gzip-compressed in the binary "messages_z" attribute. Past this many
+# compressed bytes it is split across "chat_chunk" items (SK "<chat SK>#CHUNK#0000", ...)
+# so long conversations stay under DynamoDB's 400 KB item limit. Older items keep plain
+# "messages" and are read as before.
+CHAT_CHUNK_BYTES = 350 * 1024
+CHUNK_MARKER = "#CHUNK#"
+# Archives are gzip-compressed JSONL written as they are produced; once the compressed
+# output passes one part, it goes up as a multipart upload of parts this size.
+ARCHIVE_PART_SIZE = 8 * 1024 * 1024
+ARCHIVE_SUFFIX = ".jsonl.gz"
+LEGACY_ARCHIVE_SUFFIX = ".json.gz"  # one pretty-printed JSON array; still readable
+# Catch-up stops starting new days once a cleanup pass has run this long.
+CLEANUP_TIME_BUDGET_SECONDS = 20.0
+# Background cleanup waits this long after a save so a burst of saves shares one pass,
+CLEANUP_DEBOUNCE_SECONDS = 30.0
+# and runs at most once per project in this window.
+CLEANUP_MIN_INTERVAL_SECONDS = 600.0
+
+# Per-project index of chat days: one tiny item per day (SK "DAY#YYYY-MM-DD") whose
+# chat_count save_chat bumps with an ADD in the same transaction as the chat, plus a
+# "META" item marking that chats saved before the index existed have been counted.
+# Cleanup reads the index instead of the chats themselves, so neither saves nor
+# cleanup get slower as history grows.
+DAY_INDEX_PREFIX = "CHATDAYS#"
+
+
+def _paginated_query(**kwargs):
+    """Yield every item of a chat table query, following LastEvaluatedKey."""
+    while True:
+        resp = _chat_table().query(**kwargs)
+        yield from resp.get("Items", [])
+        if "LastEvaluatedKey" not in resp:
+            return
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+def _put_chat(project: str, item: dict) -> None:
+    """Write a chat item and count it in the project's day index, in one transaction."""
+    # The resource's client takes plain Python values, like the Table calls.
+    _chat_table().meta.client.transact_write_items(TransactItems=[
+        {"Put": {"TableName": CHAT_TABLE, "Item": item}},
+        {"Update": {
+            "TableName": CHAT_TABLE,
+            "Key": {"PK": f"{DAY_INDEX_PREFIX}{project}", "SK": f"DAY#{item['SK'][:10]}"},
+            "UpdateExpression": "ADD chat_count :one",
+            "ExpressionAttributeValues": {":one": 1},
+        }},
+    ])
+
+
+def _backfill_day_index(project: str) -> dict[str, int]:
+    """Build the day index from existing chats with a keys-only, paginated query."""
+    counts: dict[str, int] = {}
+    for item in _paginated_query(
+        KeyConditionExpression=Key("PK").eq(f"CHAT#{project}"),
+        ProjectionExpression="SK",
+        ConsistentRead=True,
+    ):
+        if CHUNK_MARKER in item["SK"]:
+            continue
+        day = item["SK"][:10]  # SK starts with the ISO timestamp
+        counts[day] = counts.get(day, 0) + 1
+
+    # ADD rather than put, so counts from saves landing meanwhile are kept. Such a chat may
+    # be counted twice; counts only signal that a day has chats, so that is harmless.
+    for day, count in counts.items():
+        _chat_table().update_item(
+            Key={"PK": f"{DAY_INDEX_PREFIX}{project}", "SK": f"DAY#{day}"},
+            UpdateExpression="ADD chat_count :n",
+            ExpressionAttributeValues={":n": count},
+        )
+    try:
+        # Conditional, so a backfill racing this one cannot overwrite the marker it wrote.
+        _chat_table().put_item(
+            Item={
+                "PK": f"{DAY_INDEX_PREFIX}{project}",
+                "SK": "META",
+                "backfilled_at": datetime.now(timezone.utc).isoformat(),
+            },
+            ConditionExpression="attribute_not_exists(PK)",
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        logger.info(f"Chat day index for {project} was backfilled concurrently; counts merged")
+        return counts
+    logger.info(f"Backfilled chat day index for {project}: {len(counts)} day(s)")
+    return counts
+
+
+def _chat_days(project: str) -> list[str]:
+    """Sorted days that have chats, from the day index (backfilled on first use)."""
+    days, backfilled = set(), False
+    for item in _paginated_query(
+        KeyConditionExpression=Key("PK").eq(f"{DAY_INDEX_PREFIX}{project}"),
+        ConsistentRead=True,
+    ):
+        if item["SK"] == "META":
+            backfilled = True
+        elif item.get("chat_count", 0) > 0:
+            days.add(item["SK"][len("DAY#"):])
+    if not backfilled:
+        days.update(_backfill_day_index(project))
+    return sorted(days)
+
+
+def _chats_for_day(project: str, day: str):
+    """Yield a day's chat items page by page."""
+    yield from _paginated_query(
+        KeyConditionExpression=Key("PK").eq(f"CHAT#{project}") & Key("SK").begins_with(day),
+    )
 
 
-def _archive_to_glacier(project: str, day: str, items: list) -> str:
-    """Compress a day's chats to gzipped JSON and upload to S3 Glacier Deep Archive."""
-    # Serialize items (strip DynamoDB types via DecimalEncoder)
-    payload = json.dumps(items, cls=DecimalEncoder, indent=2).encode("utf-8")
-    compressed = gzip.compress(payload)
+def _chat_text(item: dict, chunks: list | None = None) -> str:
+    """A chat's messages: legacy plain text, inline gzip, or gzip split over chunk items."""
+    if "messages" in item:
+        return item["messages"]
+    if "messages_z" in item:
+        return gzip.decompress(bytes(item["messages_z"])).decode("utf-8")
+    if chunks:
+        return gzip.decompress(b"".join(bytes(chunk["data"]) for chunk in chunks)).decode("utf-8")
+    return ""
+
+
+def _chat_chunks(project: str, sk: str) -> list:
+    # Consistent read: chunks are written just before their chat item.
+    return list(_paginated_query(
+        KeyConditionExpression=Key("PK").eq(f"CHAT#{project}") & Key("SK").begins_with(f"{sk}{CHUNK_MARKER}"),
+        ConsistentRead=True,
+    ))
+
+
+def _assembled_chats(items):
+    """Turn day-query items (chats, each followed by its chunks) into chats with plain `messages`."""
+    chat, chunks = None, []
+    for item in itertools.chain(items, [None]):
+        if item is not None and item.get("item_type") == "chat_chunk":
+            if chat is not None and item["SK"].startswith(chat["SK"] + CHUNK_MARKER):
+                chunks.append(item)
+            continue  # orphaned chunk: deleted with the day, not archived
+        if chat is not None:
+            text = _chat_text(chat, chunks)
+            chat = {k: v for k, v in chat.items() if k not in ("messages_z", "chunk_count", "compression")}
+            chat["messages"] = text
+            yield chat
+        chat, chunks = item, []
+
+
+class _S3ArchiveUpload(io.RawIOBase):
+    """Write-only stream to S3: one put_object if small, else a multipart upload.
+
+    Call finish() after the last write; abort() discards a multipart upload.
+    """
 
-    s3_key = f"chats/archive/{project}/{day}.json.gz"
-    s3.put_object(
-        Bucket=S3_BUCKET,
-        Key=s3_key,
-        Body=compressed,
-        ContentType="application/gzip",
-        StorageClass="DEEP_ARCHIVE",
-    )
-    size_kb = len(compressed) / 1024
-    return f"s3://{S3_BUCKET}/{s3_key} ({size_kb:.1f} KB, {len(items)} chat(s))"
+    def __init__(self, key: str, part_size: int = ARCHIVE_PART_SIZE):
+        self.key = key
+        self.part_size = part_size
+        self.size = 0
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._parts = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self.size += len(data)
+        if len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+        return len(data)
+
+    def _upload_part(self, body: bytes) -> None:
+        if self._upload_id is None:
+            self._upload_id = s3.create_multipart_upload(
+                Bucket=S3_BUCKET, Key=self.key, ContentType="application/gzip", StorageClass="DEEP_ARCHIVE",
+            )["UploadId"]
+        number = len(self._parts) + 1
+        resp = s3.upload_part(Bucket=S3_BUCKET, Key=self.key, UploadId=self._upload_id, PartNumber=number, Body=body)
+        self._parts.append({"PartNumber": number, "ETag": resp["ETag"]})
+
+    def finish(self) -> None:
+        if self._upload_id is None:
+            s3.put_object(
+                Bucket=S3_BUCKET,
+                Key=self.key,
+                Body=bytes(self._buffer),
+                ContentType="application/gzip",
+                StorageClass="DEEP_ARCHIVE",
+            )
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            s3.complete_multipart_upload(
+                Bucket=S3_BUCKET, Key=self.key, UploadId=self._upload_id, MultipartUpload={"Parts": self._parts},
+            )
+        self._buffer.clear()
 
+    def abort(self) -> None:
+        if self._upload_id is not None:
+            s3.abort_multipart_upload(Bucket=S3_BUCKET, Key=self.key, UploadId=self._upload_id)
 
-def _cleanup_old_chats(project: str) -> list[str]:
-    """Archive the oldest day's chats to S3 Glacier Deep Archive, then delete from DynamoDB.
 
-    Counts distinct calendar days that have chats. If more than 14,
-    archives and removes only the oldest day's chats. This avoids wiping
-    everything if the user was away — each invocation trims at most one day.
-    """
-    resp = chat_table.query(
-        KeyConditionExpression=Key("PK").eq(f"CHAT#{project}"),
-        ScanIndexForward=True,  # oldest first
-    )
-    items = resp.get("Items", [])
-    if not items:
-        return []
+def _archive_to_glacier(project: str, day: str, items) -> str:
+    """Stream a day's chats as gzipped JSONL (one chat per line) to S3 Glacier Deep Archive."""
+    s3_key = f"chats/archive/{project}/{day}{ARCHIVE_SUFFIX}"
+    upload = _S3ArchiveUpload(s3_key)
+    count = 0
+    try:
+        with gzip.GzipFile(fileobj=upload, mode="wb", mtime=0) as gz:
+            for item in items:
+                # Strip DynamoDB types via DecimalEncoder
+                gz.write(json.dumps(item, cls=DecimalEncoder).encode("utf-8") + b"\n")
+                count += 1
+        upload.finish()
+    except BaseException:
+        upload.abort()
+        raise
+    size_kb = upload.size / 1024
+    return f"s3://{S3_BUCKET}/{s3_key} ({size_kb:.1f} KB, {count} chat(s))"
 
-    # Group items by calendar day
-    days: dict[str, list] = {}
-    for item in items:
-        day = item.get("created_at", "")[:10]
-        if day:
-            days.setdefault(day, []).append(item)
 
-    # Only clean up if we have more than 14 distinct days
-    if len(days) <= MAX_CHAT_DAYS:
+def _delete_chat_items(keys: list[dict]) -> None:
+    """Delete items in 25-item BatchWriteItem calls; batch_writer re-sends UnprocessedItems."""
+    with _chat_table().batch_writer(overwrite_by_pkeys=["PK", "SK"]) as batch:
+        for key in keys:
+            batch.delete_item(Key=key)
+
+
+def _archive_day(project: str, day: str) -> list[str]:
+    """Archive one day's chats to Glacier, then batch-delete them and the day's index entry."""
+    day_key = {"PK": f"{DAY_INDEX_PREFIX}{project}", "SK": f"DAY#{day}"}
+    items = _chats_for_day(project, day)
+    first = next(items, None)
+    if first is None:
+        _chat_table().delete_item(Key=day_key)  # stale index entry
         return []
 
-    # Archive the oldest day to Glacier, then delete from DynamoDB
-    oldest_day = sorted(days.keys())[0]
-    archived_msgs = []
+    # Items stream from the query into the archive; only their keys are kept for deletion.
+    keys = []
+    chats = 0
+
+    def tracked():
+        nonlocal chats
+        for item in itertools.chain([first], items):
+            keys.append({"PK": item["PK"], "SK": item["SK"]})
+            chats += item.get("item_type") != "chat_chunk"
+            yield item
+
+    archive_info = _archive_to_glacier(project, day, _assembled_chats(tracked()))  # raises: nothing is deleted
+    _delete_chat_items(keys + [day_key])
+    return [
+        f"  Archived to {archive_info}",
+        f"  Removed {chats} chat(s) from DynamoDB ({day})",
+    ]
 
-    try:
-        archive_info = _archive_to_glacier(project, oldest_day, days[oldest_day])
-        archived_msgs.append(f"  Archived to {archive_info}")
-    except Exception as e:
-        logger.error(f"Failed to archive chats for {project}/{oldest_day}: {e}")
-        archived_msgs.append(f"  WARNING: Archive failed ({e}), skipping deletion")
-        return archived_msgs  # Don't delete if archive failed
 
-    for item in days[oldest_day]:
-        chat_table.delete_item(Key={"PK": item["PK"], "SK": item["SK"]})
-        archived_msgs.append(f"  Removed from DynamoDB: {item.get('title', '(untitled)')} ({oldest_day})")
+def _cleanup_old_chats(project: str, time_budget: float = CLEANUP_TIME_BUDGET_SECONDS) -> list[str]:
+    """Archive chats beyond the newest 14 days to S3 Glacier Deep Archive, then delete from DynamoDB.
+
+    Counts distinct calendar days that have chats, using the day index, and
+    archives every day older than the newest 14, oldest first, until
+    `time_budget` seconds have passed; the rest waits for the next pass.
+    Days are counted by activity, not the calendar, so time away never
+    empties the history.
+    """
+    days = _chat_days(project)
+
+    # Only clean up if we have more than 14 distinct days
+    overdue = days[:-MAX_CHAT_DAYS] if len(days) > MAX_CHAT_DAYS else []
+    archived_msgs = []
+    started = time.monotonic()
+
+    for done, day in enumerate(overdue):
+        if done and time.monotonic() - started > time_budget:
+            archived_msgs.append(f"  Time budget reached; {len(overdue) - done} day(s) left for the next cleanup")
+            break
+        try:
+            archived_msgs.extend(_archive_day(project, day))
+        except Exception as e:
+            logger.error(f"Failed to archive chats for {project}/{day}: {e}")
+            archived_msgs.append(f"  WARNING: Archive failed for {day} ({e}), skipping deletion")
+            break  # Don't delete if archive failed; retry from this day next time
 
     return archived_msgs
 
 
+class CleanupScheduler:
+    """Runs _cleanup_old_chats in the background, off the save_chat path.
+
+    Requests for the same project coalesce into one pending pass, which
+    starts CLEANUP_DEBOUNCE_SECONDS after the first request and no sooner
+    than CLEANUP_MIN_INTERVAL_SECONDS after the project's previous pass.
+    Passes run one at a time on a worker thread, so the event loop keeps
+    serving tools. drain() runs whatever is still pending when the server
+    shuts down; after a hard kill those passes are skipped, and the next pass
+    for the project catches up on them.
+    """
+
+    def __init__(self):
+        self._due: dict[str, float] = {}  # project -> monotonic time the pass may start
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self.status: dict[str, dict] = {}
+
+    def request(self, project: str) -> None:
+        """Schedule a pass for `project`; must be called from the server's event loop."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        status = self.status.setdefault(project, {"requests": 0, "coalesced": 0})
+        status["requests"] += 1
+        if project in self._due:
+            status["coalesced"] += 1
+            return
+        now = time.monotonic()
+        earliest = status.get("last_finished_mono", float("-inf")) + CLEANUP_MIN_INTERVAL_SECONDS
+        self._due[project] = now if self._closing else max(now + CLEANUP_DEBOUNCE_SECONDS, earliest)
+        self._wakeup.set()
+
+    async def run_now(self, project: str) -> list[str]:
+        """Run a pass immediately (still never concurrently with another for the project)."""
+        self._due.pop(project, None)
+        return await self._run_one(project)
+
+    async def drain(self) -> None:
+        """Start every pending pass now, ignoring debounce and interval, and wait for them all.
+
+        A pass already running is allowed to finish rather than cancelled.
+        """
+        self._closing = True
+        if self._task is None or self._task.done():
+            return
+        for project in self._due:
+            self._due[project] = float("-inf")
+        self._wakeup.set()
+        await self._task
+
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+            due = [project for project, at in self._due.items() if at <= now]
+            for project in due:
+                self._due.pop(project, None)
+                await self._run_one(project)
+            if due:
+                continue
+            if self._closing:
+                return
+            timeout = min(self._due.values()) - now if self._due else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_one(self, project: str) -> list[str]:
+        status = self.status.setdefault(project, {"requests": 0, "coalesced": 0})
+        async with self._locks.setdefault(project, asyncio.Lock()):
+            status.update(running=True, last_started=datetime.now(timezone.utc).isoformat())
+            started = time.monotonic()
+            try:
+                result = await asyncio.to_thread(_cleanup_old_chats, project)
+                status.update(last_result=result, last_error=None)
+            except Exception as e:
+                logger.error(f"Background cleanup failed for {project}: {e}")
+                result = [f"  WARNING: Cleanup failed ({e})"]
+                status.update(last_result=None, last_error=str(e))
+            finally:
+                status.update(
+                    running=False,
+                    last_duration=time.monotonic() - started,
+                    last_finished_mono=time.monotonic(),
+                )
+        return result
+
+    def describe(self, project: str = "") -> list[str]:
+        now = time.monotonic()
+        lines = []
+        for name in sorted(self.status):
+            if project and name != project:
+                continue
+            st = self.status[name]
+            if st.get("running"):
+                state = "running"
+            elif name in self._due:
+                state = f"scheduled in {max(0.0, self._due[name] - now):.0f}s"
+            else:
+                state = "idle"
+            lines.append(f"{name}: {state}; {st['requests']} request(s), {st['coalesced']} coalesced")
+            if "last_started" in st:
+                lines.append(f"  last run: {st['last_started'][:19]} ({st['last_duration']:.1f}s)")
+            if st.get("last_error"):
+                lines.append(f"  last error: {st['last_error']}")
+            elif st.get("last_result"):
+                lines.extend(st["last_result"])
+            elif "last_started" in st:
+                lines.append("  nothing to archive")
+        return lines
+
+
+cleanup_scheduler = CleanupScheduler()
+
+
 @mcp.tool()
-def cleanup_chats(project: str) -> str:
-    """Clean up chat history older than 14 days for a project.
+async def cleanup_chats(project: str) -> str:
+    """Clean up chat history older than 14 days for a project, right now.
 
-    Call this automatically:
-    - At the start of every new conversation
-    - When a conversation has been idle for 5+ minutes
+    Not needed routinely: save_chat already schedules this in the
+    background. Use it to force a pass, e.g. after importing old chats.
 
-    Archives the oldest day's chats to S3 Glacier Deep Archive, then
-    removes them from DynamoDB. Only one day per invocation to avoid
-    emptying everything if the user was away for a while.
+    Archives every day beyond the newest 14 days that have chats to S3
+    Glacier Deep Archive, then removes them from DynamoDB, catching up on
+    a whole backlog in one call (within a time budget). The newest 14
+    active days are always kept, so being away never empties the history.
 
     Args:
         project: Project name (e.g. 'he-feeds-dinosaurs', 'chinaless', 'danieldow')
     """
-    archived = _cleanup_old_chats(project)
+    archived = await cleanup_scheduler.run_now(project)
     if archived:
         return f"Archived & cleaned up old chat(s):\n" + "\n".join(archived)
     return "No chats older than 14 days found. Nothing to clean up."
 
 
 @mcp.tool()
-def save_chat(project: str, title: str, messages: str) -> str:
+def cleanup_status(project: str = "") -> str:
+    """Show the background chat-cleanup worker's state: pending, running and last results.
+
+    Args:
+        project: Only show this project (default: all projects seen since the server started)
+    """
+    lines = cleanup_scheduler.describe(project)
+    if not lines:
+        return "No cleanup has been requested since the server started."
+    return "\n".join(lines)
+
+
+@mcp.tool()
+async def save_chat(project: str, title: str, messages: str) -> str:
     """Save a chat conversation to the dashboard-chat-history DynamoDB table.
 
     Use this to persist important Sonnet/Claude conversations.
@@ -349,28 +734,46 @@ def save_chat(project: str, title: str, messages: str) -> str:
         project: Project name (e.g. 'he-feeds-dinosaurs', 'chinaless', 'danieldow')
         title: Short title for the conversation
         messages: The conversation content (full text or JSON array of messages)
+
+    One transactional write stores the chat and bumps its day in the day
+    index. Chats too large for one item first write their chunks.
     """
     now = datetime.now(timezone.utc)
     timestamp = now.isoformat()
     chat_id = now.strftime("%Y%m%d_%H%M%S")
 
-    chat_table.put_item(Item={
-        "PK": f"CHAT#{project}",
-        "SK": f"{timestamp}#{chat_id}",
+    pk, sk = f"CHAT#{project}", f"{timestamp}#{chat_id}"
+    item = {
+        "PK": pk,
+        "SK": sk,
         "item_type": "chat",
         "title": title,
-        "messages": messages,
         "created_at": timestamp,
         "word_count": len(messages.split()),
-    })
+        "compression": "gzip",
+    }
+    compressed = gzip.compress(messages.encode("utf-8"), mtime=0)
+    if len(compressed) <= CHAT_CHUNK_BYTES:
+        item["messages_z"] = compressed
+    else:
+        chunks = [compressed[i:i + CHAT_CHUNK_BYTES] for i in range(0, len(compressed), CHAT_CHUNK_BYTES)]
+        item["chunk_count"] = len(chunks)
 
-    # Archive chats older than 14 days to Glacier (one oldest day per save)
-    archived = _cleanup_old_chats(project)
+        def put_chunks():
+            with _chat_table().batch_writer() as batch:
+                for n, data in enumerate(chunks):
+                    batch.put_item(Item={"PK": pk, "SK": f"{sk}{CHUNK_MARKER}{n:04d}", "item_type": "chat_chunk",
+                                         "data": data})
 
-    result = f"Chat saved: [{project}] {title} ({len(messages.split())} words)"
-    if archived:
-        result += f"\nArchived & cleaned up old chat(s):\n" + "\n".join(archived)
-    return result
+        # Chunks first, so a listed chat always has all of its chunks.
+        await asyncio.to_thread(put_chunks)
+    # The chat and its day-index ADD commit together, so no chat is ever missing from the index.
+    await asyncio.to_thread(_put_chat, project, item)
+
+    # Archive chats beyond the newest 14 days to Glacier, in the background
+    cleanup_scheduler.request(project)
+
+    return f"Chat saved: [{project}] {title} ({len(messages.split())} words)"
 
 
 @mcp.tool()
@@ -381,12 +784,24 @@ def list_chats(project: str, limit: int = 20) -> str:
         project: Project name (e.g. 'he-feeds-dinosaurs', 'chinaless', 'danieldow')
         limit: Max number of chats to return (default 20)
     """
-    resp = chat_table.query(
-        KeyConditionExpression=Key("PK").eq(f"CHAT#{project}"),
-        Limit=min(limit, 50),
-        ScanIndexForward=False,
-    )
-    items = resp.get("Items", [])
+    # Chunk items share the partition, so filter to chats and keep paging until `limit`
+    # are found; the projection skips the message bodies.
+    limit = min(limit, 50)
+    kwargs = {
+        "KeyConditionExpression": Key("PK").eq(f"CHAT#{project}"),
+        "FilterExpression": Attr("item_type").eq("chat"),
+        "ProjectionExpression": "SK, title, created_at, word_count",
+        "ScanIndexForward": False,
+        "Limit": limit,
+    }
+    items = []
+    while len(items) < limit:
+        resp = _chat_table().query(**kwargs)
+        items.extend(resp.get("Items", []))
+        if "LastEvaluatedKey" not in resp:
+            break
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+    items = items[:limit]
     if not items:
         return f"No chats found for project '{project}'."
 
@@ -408,14 +823,15 @@ def get_chat(project: str, sk: str) -> str:
         project: Project name
         sk: The sort key from list_chats output
     """
-    resp = chat_table.get_item(Key={"PK": f"CHAT#{project}", "SK": sk})
+    resp = _chat_table().get_item(Key={"PK": f"CHAT#{project}", "SK": sk})
     item = resp.get("Item")
     if not item:
         return f"Chat not found: PK=CHAT#{project}, SK={sk}"
 
     title = item.get("title", "(untitled)")
     created = item.get("created_at", "")[:19]
-    messages = item.get("messages", "")
+    chunks = _chat_chunks(project, sk) if item.get("chunk_count") else None
+    messages = _chat_text(item, chunks)
     return f"# {title}\nCreated: {created}\n\n{messages}"
 
 
@@ -440,7 +856,7 @@ def list_archived_chats(project: str) -> str:
     lines = [f"Archived chats for '{project}' ({len(objects)} day(s)):"]
     for obj in sorted(objects, key=lambda x: x["Key"], reverse=True):
         key = obj["Key"]
-        date = key.split("/")[-1].replace(".json.gz", "")
+        date = key.split("/")[-1].removesuffix(ARCHIVE_SUFFIX).removesuffix(LEGACY_ARCHIVE_SUFFIX)
         size_kb = obj["Size"] / 1024
         storage = obj.get("StorageClass", "STANDARD")
         lines.append(f"  {date}  ({size_kb:.1f} KB, {storage})")
@@ -460,16 +876,18 @@ def restore_archived_chat(project: str, date: str) -> str:
         project: Project name (e.g. 'he-feeds-dinosaurs', 'chinaless', 'danieldow')
         date: The date to restore (YYYY-MM-DD format, from list_archived_chats output)
     """
-    s3_key = f"chats/archive/{project}/{date}.json.gz"
-
-    # Check if the object exists and its restore status
-    try:
-        head = s3.head_object(Bucket=S3_BUCKET, Key=s3_key)
-    except Exception as e:
-        error_code = getattr(e, "response", {}).get("Error", {}).get("Code", "")
-        if error_code in ("404", "NoSuchKey") or "Not Found" in str(e):
-            return f"No archive found for {project}/{date}. Use list_archived_chats to see available dates."
-        raise
+    # Check if the object exists (current JSONL format first, then legacy JSON) and its restore status
+    for suffix in (ARCHIVE_SUFFIX, LEGACY_ARCHIVE_SUFFIX):
+        s3_key = f"chats/archive/{project}/{date}{suffix}"
+        try:
+            head = s3.head_object(Bucket=S3_BUCKET, Key=s3_key)
+            break
+        except Exception as e:
+            error_code = getattr(e, "response", {}).get("Error", {}).get("Code", "")
+            if not (error_code in ("404", "NoSuchKey") or "Not Found" in str(e)):
+                raise
+    else:
+        return f"No archive found for {project}/{date}. Use list_archived_chats to see available dates."
 
     storage_class = head.get("StorageClass", "STANDARD")
     restore_status = head.get("Restore", "")
@@ -511,14 +929,24 @@ def restore_archived_chat(project: str, date: str) -> str:
         raise
 
 
+def _iter_archive(s3_key: str):
+    """Yield the chat items of an archive, decompressing the S3 body as it streams in."""
+    body = s3.get_object(Bucket=S3_BUCKET, Key=s3_key)["Body"]
+    with gzip.GzipFile(fileobj=body, mode="rb") as gz:
+        if s3_key.endswith(LEGACY_ARCHIVE_SUFFIX):
+            yield from json.load(gz)  # legacy single JSON array
+            return
+        for line in io.TextIOWrapper(gz, encoding="utf-8"):
+            if line.strip():
+                yield json.loads(line)
+
+
 def _download_and_format_archive(s3_key: str, project: str, date: str) -> str:
     """Download a gzipped chat archive from S3 and format it for display."""
-    resp = s3.get_object(Bucket=S3_BUCKET, Key=s3_key)
-    compressed = resp["Body"].read()
-    data = json.loads(gzip.decompress(compressed).decode("utf-8"))
-
-    lines = [f"# Archived chats for {project} — {date}", f"{len(data)} conversation(s):", ""]
-    for item in data:
+    lines = []
+    count = 0
+    for item in _iter_archive(s3_key):
+        count += 1
         title = item.get("title", "(untitled)")
         created = item.get("created_at", "")[:19]
         words = item.get("word_count", 0)
@@ -530,7 +958,8 @@ def _download_and_format_archive(s3_key: str, project: str, date: str) -> str:
         lines.append("---")
         lines.append("")
 
-    return "\n".join(lines)
+    header = [f"# Archived chats for {project} — {date}", f"{count} conversation(s):", ""]
+    return "\n".join(header + lines)
 
 
 if __name__ == "__main__":
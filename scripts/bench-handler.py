@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""Cold-start and warm-latency benchmark for the Mangum Lambda handler.
+
+Sends synthetic API Gateway v2 events for POST /login, GET /dashboard and
+GET /public/* either
+
+  * in-process (default): cold samples import main.py in a fresh interpreter
+    and time init plus the first invocation; warm samples call `handler`
+    repeatedly in this process, or
+  * against the local Lambda container started by scripts/run-local.sh
+    (--container-url): the first invocation after the container starts is
+    reported as cold, the rest as warm.
+
+In DRY_RUN the fixture user's password is hashed on first use, so cold
+/login and /dashboard samples include one bcrypt hash where production would
+make a DynamoDB read instead.
+
+Prints p50/p95/p99 per route and writes JSON for regression tracking. Pass
+--compare with an earlier JSON file to see the change between commits.
+
+Usage (in-process needs the backend requirements installed):
+    python3 scripts/bench-handler.py --output bench.json
+    python3 scripts/bench-handler.py --compare bench.json
+    python3 scripts/bench-handler.py --container-url http://localhost:9000/2015-03-31/functions/function/invocations
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+BACKEND = REPO / "dashboard-app" / "backend"
+
+# DRY_RUN user; rate limits lifted so repeated logins are not throttled.
+BENCH_ENV = {
+    "DRY_RUN": "true",
+    "SECRET_KEY": "bench-secret",
+    "LOG_LEVEL": "WARNING",
+    "LOGIN_IP_BURST": "1000000",
+    "LOGIN_ACCOUNT_BURST": "1000000",
+}
+LOGIN_BODY = "username=testuser@example.com&password=Passw0rd%21"
+ROUTES = ("login", "dashboard", "public")
+
+
+def make_event(route: str, token: str = "") -> dict:
+    """Synthetic API Gateway HTTP API (payload v2.0) event."""
+    method, path, headers, body = {
+        "login": ("POST", "/login", {"content-type": "application/x-www-form-urlencoded"}, LOGIN_BODY),
+        "dashboard": ("GET", "/dashboard", {"authorization": f"Bearer {token}"}, ""),
+        "public": ("GET", "/public/index.html", {}, ""),
+    }[route]
+    return {
+        "version": "2.0",
+        "routeKey": f"{method} {path}",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {"host": "bench.local", **headers},
+        "requestContext": {
+            "http": {"method": method, "path": path, "sourceIp": "127.0.0.1", "protocol": "HTTP/1.1"},
+            "requestId": uuid.uuid4().hex,
+            "stage": "$default",
+        },
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+class FakeContext:
+    def __init__(self):
+        self.aws_request_id = uuid.uuid4().hex
+        self.function_name = "dashboard-backend-bench"
+
+
+# Run in a fresh interpreter per cold sample with the event JSON as argv[1]; prints one BENCH_RESULT line.
+COLD_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import main
+init_ms = (time.perf_counter() - started) * 1000
+event = json.loads(sys.argv[1])
+if "authorization" in event["headers"]:
+    claims = main.profile_claims({"email": "testuser@example.com", "name": "Test User"})
+    event["headers"]["authorization"] = "Bearer " + main.create_access_token(claims)
+class Context:
+    aws_request_id = "cold-sample"
+    function_name = "dashboard-backend-bench"
+t = time.perf_counter()
+resp = main.handler(event, Context())
+first_ms = (time.perf_counter() - t) * 1000
+print("BENCH_RESULT " + json.dumps({"init_ms": init_ms, "first_ms": first_ms, "status": resp["statusCode"]}))
+"""
+
+
+def summarize(samples_ms: list) -> dict:
+    if not samples_ms:
+        return {}
+    ordered = sorted(samples_ms)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 3)
+
+    return {
+        "n": len(ordered),
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(statistics.median(ordered), 3),
+        "p95": pct(95),
+        "p99": pct(99),
+    }
+
+
+def cold_in_process(route: str, samples: int) -> dict:
+    init, first = [], []
+    env = {**os.environ, **BENCH_ENV}
+    for _ in range(samples):
+        event = json.dumps(make_event(route, token="placeholder"))
+        proc = subprocess.run([sys.executable, "-c", COLD_CHILD, event], cwd=BACKEND, env=env,
+                              capture_output=True, text=True)
+        line = next((l for l in proc.stdout.splitlines() if l.startswith("BENCH_RESULT ")), None)
+        if proc.returncode or line is None:
+            sys.exit(f"Cold sample for {route} failed:\n{proc.stderr[-2000:]}")
+        result = json.loads(line.split(" ", 1)[1])
+        init.append(result["init_ms"])
+        first.append(result["first_ms"])
+    return {"init_ms": summarize(init), "first_invocation_ms": summarize(first),
+            "total_ms": summarize([a + b for a, b in zip(init, first)])}
+
+
+def warm_in_process(route: str, iterations: int) -> dict:
+    import main  # noqa: imported lazily so --container-url works without backend deps
+
+    token = main.create_access_token(main.profile_claims({"email": "testuser@example.com", "name": "Test User"}))
+    main.handler(make_event(route, token), FakeContext())  # exclude the first call from warm numbers
+    samples = []
+    for _ in range(iterations):
+        event = make_event(route, token)
+        started = time.perf_counter()
+        resp = main.handler(event, FakeContext())
+        samples.append((time.perf_counter() - started) * 1000)
+        if resp["statusCode"] >= 400:
+            sys.exit(f"{route} returned {resp['statusCode']}: {resp.get('body', '')[:200]}")
+    return summarize(samples)
+
+
+def invoke_container(url: str, event: dict) -> tuple:
+    req = urllib.request.Request(url, data=json.dumps(event).encode(), headers={"Content-Type": "application/json"})
+    started = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=60) as resp:
+        payload = json.load(resp)
+    return (time.perf_counter() - started) * 1000, payload
+
+
+def bench_container(url: str, iterations: int) -> dict:
+    results = {}
+    cold_ms, payload = invoke_container(url, make_event("login"))
+    token = json.loads(payload.get("body") or "{}").get("access_token", "")
+    results["login"] = {"cold": {"first_invocation_ms": summarize([cold_ms])}}
+    for route in ROUTES:
+        samples = [invoke_container(url, make_event(route, token))[0] for _ in range(iterations)]
+        results.setdefault(route, {})["warm"] = summarize(samples)
+    return results
+
+
+def print_table(results: dict):
+    print(f"{'route':<10} {'phase':<6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, phases in results.items():
+        cold = phases.get("cold", {})
+        cold_stats = cold.get("total_ms") or cold.get("first_invocation_ms")
+        for phase, stats in (("cold", cold_stats), ("warm", phases.get("warm"))):
+            if stats:
+                print(f"{route:<10} {phase:<6} {stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['p99']:>9.2f}")
+
+
+def print_comparison(results: dict, baseline: dict):
+    print(f"\nvs {baseline.get('commit', '?')[:10]} (p50):")
+    for route, phases in results.items():
+        for phase in ("cold", "warm"):
+            new = phases.get(phase, {})
+            old = baseline.get("results", {}).get(route, {}).get(phase, {})
+            if phase == "cold":
+                new = new.get("total_ms") or new.get("first_invocation_ms") or {}
+                old = old.get("total_ms") or old.get("first_invocation_ms") or {}
+            if new.get("p50") and old.get("p50"):
+                change = (new["p50"] - old["p50"]) / old["p50"] * 100
+                print(f"  {route:<10} {phase:<6} {old['p50']:>9.2f} -> {new['p50']:>9.2f} ms ({change:+.1f}%)")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--container-url", help="Lambda RIE invocation URL instead of in-process")
+    parser.add_argument("--routes", nargs="+", choices=ROUTES, default=list(ROUTES))
+    parser.add_argument("--cold-samples", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=200, help="Warm invocations per route")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--compare", help="Earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    if args.container_url:
+        mode = "container"
+        results = bench_container(args.container_url, args.iterations)
+        results = {route: results[route] for route in args.routes if route in results}
+    else:
+        mode = "in-process"
+        os.environ.update(BENCH_ENV)
+        os.chdir(BACKEND)
+        sys.path.insert(0, str(BACKEND))
+        results = {}
+        for route in args.routes:
+            results[route] = {"cold": cold_in_process(route, args.cold_samples)}
+        for route in args.routes:
+            results[route]["warm"] = warm_in_process(route, args.iterations)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "mode": mode,
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+    print_table(results)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
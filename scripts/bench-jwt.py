@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Microbenchmark per-request JWT verification cost in the backend.
+
+Compares three paths for the same HS256 token:
+  jose      jose.jwt.decode, the verification the backend used originally
+  prepared  auth.verify_token with the precomputed HMAC signer (cache bypassed)
+  cached    auth.decode_token_claims on a token that was already verified
+
+Usage (needs the backend requirements installed):
+    python3 scripts/bench-jwt.py --iterations 20000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent / "dashboard-app" / "backend"
+sys.path.insert(0, str(BACKEND))
+os.environ.setdefault("DRY_RUN", "true")
+
+import auth  # noqa: E402
+from jose import jwt  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = auth.create_access_token({"sub": "testuser@example.com", "name": "Test User", "ver": 0})
+    key = auth.SIGNING_KEYS[auth.ACTIVE_KID] if auth.ACTIVE_KID else auth.SECRET_KEY
+    auth.decode_token_claims(token)  # warm the cache for the "cached" case
+
+    cases = {
+        "jose": lambda: jwt.decode(token, key, algorithms=[auth.ALGORITHM]),
+        "prepared": lambda: auth.verify_token(token),
+        "cached": lambda: auth.decode_token_claims(token),
+    }
+    baseline = None
+    print(f"{'path':<10} {'us/verify':>10} {'speedup':>8}")
+    for name, fn in cases.items():
+        seconds = min(timeit.repeat(fn, number=args.iterations, repeat=3))
+        per_call_us = seconds / args.iterations * 1e6
+        baseline = baseline or per_call_us
+        print(f"{name:<10} {per_call_us:>10.2f} {baseline / per_call_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
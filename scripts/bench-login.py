@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Benchmark login throughput and /dashboard tail latency under concurrent logins.
+
+Fires `--logins` concurrent POST /login loops for `--duration` seconds while
+one client repeatedly calls GET /dashboard. Reports login throughput, 503
+back-pressure responses and dashboard p50/p95/p99. Every login is for one
+account from one IP, so the /login rate limiter must be lifted or the run
+measures 429s instead of bcrypt. `--serve` starts a local DRY_RUN backend
+with SERVER_ENV (limits raised) for the duration of the run:
+
+    python3 scripts/bench-login.py --serve --logins 16
+
+or start it yourself with the same settings:
+
+    (cd dashboard-app/backend && DRY_RUN=true LOGIN_IP_BURST=1000000 LOGIN_ACCOUNT_BURST=1000000 \
+        LOGIN_IP_PER_MINUTE=1000000 LOGIN_ACCOUNT_PER_MINUTE=1000000 uvicorn main:app --port 8000)
+    python3 scripts/bench-login.py --url http://127.0.0.1:8000 --logins 16
+
+Non-200 logins are reported separately, with a warning if any were throttled.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+
+EMAIL = "testuser@example.com"
+PASSWORD = "Passw0rd!"
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dashboard-app", "backend")
+SERVER_ENV = {
+    "DRY_RUN": "true",
+    "LOG_LEVEL": "WARNING",
+    "LOGIN_IP_BURST": "1000000",
+    "LOGIN_IP_PER_MINUTE": "1000000",
+    "LOGIN_ACCOUNT_BURST": "1000000",
+    "LOGIN_ACCOUNT_PER_MINUTE": "1000000",
+}
+
+
+def post_login(url: str) -> int:
+    body = urllib.parse.urlencode({"username": EMAIL, "password": PASSWORD}).encode()
+    req = urllib.request.Request(f"{url}/login", data=body, method="POST")
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def get_token(url: str) -> str:
+    body = urllib.parse.urlencode({"username": EMAIL, "password": PASSWORD}).encode()
+    with urllib.request.urlopen(f"{url}/login", data=body, timeout=30) as resp:
+        return json.load(resp)["access_token"]
+
+
+def get_dashboard(url: str, token: str) -> float:
+    req = urllib.request.Request(f"{url}/dashboard", headers={"Authorization": f"Bearer {token}"})
+    started = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        resp.read()
+    return time.perf_counter() - started
+
+
+def start_server(url: str) -> subprocess.Popen:
+    """Run uvicorn on the --url port with SERVER_ENV and wait for /healthz."""
+    port = urllib.parse.urlsplit(url).port or 8000
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+                            cwd=BACKEND, env={**os.environ, **SERVER_ENV})
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            sys.exit("Backend exited during startup")
+        try:
+            with urllib.request.urlopen(f"{url}/healthz", timeout=1):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    sys.exit("Backend did not become healthy within 30s")
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--logins", type=int, default=16, help="Concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--serve", action="store_true", help="Start a local backend with SERVER_ENV for the run")
+    args = parser.parse_args()
+
+    server = start_server(args.url) if args.serve else None
+    try:
+        run(args)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+def run(args):
+    token = get_token(args.url)
+    stop = threading.Event()
+    statuses = Counter()
+    lock = threading.Lock()
+    dashboard_latencies = []
+
+    def login_loop():
+        while not stop.is_set():
+            code = post_login(args.url)
+            with lock:
+                statuses[code] += 1
+
+    def dashboard_loop():
+        while not stop.is_set():
+            dashboard_latencies.append(get_dashboard(args.url, token))
+
+    threads = [threading.Thread(target=login_loop) for _ in range(args.logins)]
+    threads.append(threading.Thread(target=dashboard_loop))
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    ms = [v * 1000 for v in dashboard_latencies]
+    not_ok = sum(count for code, count in statuses.items() if code != 200)
+    print(json.dumps({
+        "login_clients": args.logins,
+        "seconds": round(elapsed, 2),
+        "logins_ok_per_s": round(statuses[200] / elapsed, 2),
+        "logins_not_ok": not_ok,
+        "login_status_counts": dict(statuses),
+        "dashboard_requests": len(ms),
+        "dashboard_ms": {
+            "p50": round(statistics.median(ms), 2) if ms else None,
+            "p95": round(percentile(ms, 95), 2),
+            "p99": round(percentile(ms, 99), 2),
+        },
+    }, indent=2))
+    if statuses[429]:
+        print(f"⚠️ {statuses[429]} of {sum(statuses.values())} logins were throttled (429): the numbers above "
+              "measure the rate limiter, not bcrypt. Use --serve or raise the LOGIN_* limits.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark the parallel S3 upload engine in dashboard_agent.py.
+
+Generates synthetic React-style builds of increasing size and uploads each
+one with a range of worker counts against a local S3 stand-in, printing
+wall-clock time per (file count, workers) pair.
+
+The stand-in is either an endpoint you already run (MinIO, LocalStack,
+`moto_server`) passed with --endpoint-url, or, when omitted, an in-process
+moto server (`pip install "moto[server]"`).
+
+Usage:
+    python3 scripts/bench-s3-upload.py
+    python3 scripts/bench-s3-upload.py --endpoint-url http://localhost:9000 --files 100 500 --workers 1 8 32
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dashboard_agent  # noqa: E402
+
+BUCKET = "bench-dashboard-upload"
+
+
+def make_build(root: Path, count: int, size: int) -> list:
+    """Write `count` files of `size` bytes shaped like a CRA build."""
+    for i in range(count):
+        sub = ("js", "css", "media")[i % 3]
+        path = root / "static" / sub / f"chunk{i}.{i:08x}.bin"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(os.urandom(size))
+    (root / "index.html").write_text("<!doctype html><div id=root></div>")
+    return [
+        dashboard_agent.prepare_asset(full_path, key)
+        for full_path, key in dashboard_agent.collect_build_files(str(root))
+    ]
+
+
+def start_moto():
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError:
+        sys.exit('No --endpoint-url given and moto is not installed (pip install "moto[server]").')
+    server = ThreadedMotoServer(port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    return server, f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint-url", help="S3-compatible endpoint (default: in-process moto)")
+    parser.add_argument("--files", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--size", type=int, default=16 * 1024, help="Bytes per file")
+    args = parser.parse_args()
+
+    server = None
+    endpoint = args.endpoint_url
+    if not endpoint:
+        server, endpoint = start_moto()
+    os.environ["AWS_ENDPOINT_URL_S3"] = endpoint
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+    # Silence per-file progress lines so only the summary table is printed.
+    dashboard_agent.click.echo = lambda *a, **k: None
+
+    try:
+        print(f"S3 endpoint: {endpoint}")
+        print(f"{'files':>6} {'workers':>8} {'seconds':>9} {'files/s':>9}")
+        for count in args.files:
+            with tempfile.TemporaryDirectory() as tmp:
+                files = make_build(Path(tmp), count, args.size)
+                for workers in args.workers:
+                    s3 = dashboard_agent.make_s3_client(workers)
+                    try:
+                        s3.create_bucket(Bucket=BUCKET)
+                    except s3.exceptions.BucketAlreadyOwnedByYou:
+                        pass
+                    started = time.perf_counter()
+                    failures = dashboard_agent.upload_files(s3, BUCKET, files, workers=workers)
+                    elapsed = time.perf_counter() - started
+                    note = f"  ({len(failures)} failed)" if failures else ""
+                    print(f"{len(files):>6} {workers:>8} {elapsed:>9.2f} {len(files) / elapsed:>9.1f}{note}")
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Build responsive image derivatives for the backend's public/ directory.
+
+For every JPEG/PNG under <public>/img this writes resized copies at each
+requested width (never upscaled) as WebP, AVIF (when Pillow supports it)
+and a JPEG/PNG fallback. It applies the EXIF orientation and drops all
+metadata. Files are named `<stem>-<width>.<hash>.<ext>` so the backend
+serves them as immutable. It then rewrites every
+`<img data-responsive src="/public/img/...">` in the HTML files into a
+`<picture>` with `srcset`, and removes the originals it replaced. A tag may
+name its source with `data-source="/public/img/..."` instead; its `src` is
+then kept as the `<img>` fallback (e.g. a copy on the assets bucket).
+
+Run it against the packaged copy (deploy/modules/01_package_lambda.sh does
+this), not the source tree. Pillow is required (it is in requirements.txt);
+without it the script exits non-zero so packaging stops instead of shipping
+the full-size originals.
+
+Usage:
+    python3 scripts/build-images.py --public dashboard-app/backend/lambda-build/public
+    python3 scripts/build-images.py --public /tmp/public --widths 640 1280 --dry-run
+"""
+
+import argparse
+import hashlib
+import html
+import io
+import re
+import sys
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # reported by main() so --help still works
+    Image = None
+
+DEFAULT_WIDTHS = (480, 768, 1080, 1536)
+SOURCE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+URL_PREFIX = "/public/"
+HASH_LENGTH = 10
+IMG_TAG_RE = re.compile(r"<img\b[^>]*\bdata-responsive\b[^>]*>", re.IGNORECASE)
+ATTR_RE = re.compile(r'([\w-]+)(?:\s*=\s*"([^"]*)")?')
+# Already content-hashed output from an earlier run.
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{8,}\.[a-z0-9]+$")
+
+
+def encoders(quality: int) -> list:
+    """(mime type, extension, save kwargs) per modern format, best first."""
+    formats = []
+    if features.check("avif"):
+        formats.append(("image/avif", "avif", {"format": "AVIF", "quality": max(quality - 15, 30)}))
+    formats.append(("image/webp", "webp", {"format": "WEBP", "quality": quality, "method": 6}))
+    return formats
+
+
+def fallback_encoder(source: Path, quality: int) -> tuple:
+    if source.suffix.lower() == ".png":
+        return ("image/png", "png", {"format": "PNG", "optimize": True})
+    return ("image/jpeg", "jpg", {"format": "JPEG", "quality": quality, "optimize": True, "progressive": True})
+
+
+def encode(image, save_kwargs: dict) -> bytes:
+    buffer = io.BytesIO()
+    # No exif/icc_profile/xmp kwargs, so nothing from the camera is carried over.
+    image.save(buffer, **save_kwargs)
+    return buffer.getvalue()
+
+
+def build_variants(source: Path, widths: list, quality: int, dry_run: bool) -> dict:
+    """Write derivatives for one image. Returns {"width", "height", "sets": {mime: [(w, name)]}}."""
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    targets = sorted({w for w in widths if w < image.width} | {min(max(widths), image.width)})
+
+    sets = {}
+    total_bytes = 0
+    formats = encoders(quality) + [fallback_encoder(source, quality)]
+    for width in targets:
+        height = round(image.height * width / image.width)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for mime, ext, save_kwargs in formats:
+            if ext == "jpg" and resized.mode == "RGBA":
+                resized = resized.convert("RGB")
+            data = encode(resized, save_kwargs)
+            digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+            name = f"{source.stem}-{width}.{digest}.{ext}"
+            if not dry_run:
+                (source.parent / name).write_bytes(data)
+            sets.setdefault(mime, []).append((width, name))
+            total_bytes += len(data)
+    print(f"  {source.name}: {source.stat().st_size / 1024:.0f} KiB -> {len(targets)} widths, "
+          f"{', '.join(sets)} ({total_bytes / 1024:.0f} KiB total)")
+    return {"width": image.width, "height": image.height, "sets": sets}
+
+
+def srcset(url_dir: str, entries: list) -> str:
+    return ", ".join(f"{url_dir}{name} {width}w" for width, name in entries)
+
+
+def picture_markup(tag: str, variants: dict, url_dir: str) -> str:
+    attrs = {name.lower(): value for name, value in ATTR_RE.findall(tag[len("<img"):].rstrip("/>"))}
+    attrs.pop("data-responsive", None)
+    source_attr = attrs.pop("data-source", None)
+    original_src = attrs.pop("src", None)
+    attrs.pop("srcset", None)
+    sizes = attrs.pop("sizes", "") or "100vw"
+    *modern, fallback = variants["sets"].items()
+    fallback_mime, fallback_entries = fallback
+    # For browsers without srcset support: the tag's own src when it named a separate
+    # data-source, else a mid-sized derivative.
+    if source_attr and original_src:
+        fallback_src = original_src
+    else:
+        fallback_src = url_dir + fallback_entries[len(fallback_entries) // 2][1]
+    attrs.setdefault("width", str(variants["width"]))
+    attrs.setdefault("height", str(variants["height"]))
+    attrs.setdefault("decoding", "async")
+
+    lines = ["<picture>"]
+    for mime, entries in modern:
+        lines.append(f'  <source type="{mime}" srcset="{srcset(url_dir, entries)}" sizes="{sizes}">')
+    img_attrs = " ".join(f'{k}="{html.escape(v, quote=True)}"' if v is not None else k for k, v in attrs.items())
+    lines.append(f'  <img src="{html.escape(fallback_src, quote=True)}" srcset="{srcset(url_dir, fallback_entries)}" '
+                 f'sizes="{sizes}" {img_attrs}>')
+    lines.append("</picture>")
+    return "\n".join(lines)
+
+
+def rewrite_html(page: Path, public: Path, built: dict, dry_run: bool) -> int:
+    text = page.read_text()
+    rewritten = 0
+
+    def replace(match):
+        nonlocal rewritten
+        attrs = dict(ATTR_RE.findall(match.group(0)))
+        src = attrs.get("data-source") or attrs.get("src", "")
+        if not src.startswith(URL_PREFIX):
+            return match.group(0)
+        source = public / src[len(URL_PREFIX):]
+        if source not in built:
+            return match.group(0)
+        rewritten += 1
+        url_dir = src.rsplit("/", 1)[0] + "/"
+        indent = re.search(r"[ \t]*$", text[:match.start()]).group(0)
+        return picture_markup(match.group(0), built[source], url_dir).replace("\n", "\n" + indent)
+
+    new_text = IMG_TAG_RE.sub(replace, text)
+    if rewritten and not dry_run:
+        page.write_text(new_text)
+    return rewritten
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--public", required=True, help="public/ directory to process (the packaged copy)")
+    parser.add_argument("--widths", type=int, nargs="+", default=list(DEFAULT_WIDTHS))
+    parser.add_argument("--quality", type=int, default=75)
+    parser.add_argument("--keep-originals", action="store_true", help="Leave the source images in place")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be built without writing")
+    args = parser.parse_args()
+
+    if Image is None:
+        print("❌ Pillow is not installed; cannot build image derivatives (pip install -r requirements.txt)",
+              file=sys.stderr)
+        return 1
+    public = Path(args.public)
+    img_dir = public / "img"
+    sources = sorted(
+        p for p in img_dir.rglob("*")
+        if p.suffix.lower() in SOURCE_SUFFIXES and not HASHED_NAME_RE.search(p.name)
+    ) if img_dir.is_dir() else []
+    if not sources:
+        print(f"No source images under {img_dir}")
+        return
+
+    print(f"🖼️ Building image derivatives in {img_dir} (AVIF: {'yes' if features.check('avif') else 'no'})")
+    built = {source: build_variants(source, args.widths, args.quality, args.dry_run) for source in sources}
+
+    referenced = set()
+    for page in sorted(public.rglob("*.html")):
+        count = rewrite_html(page, public, built, args.dry_run)
+        if count:
+            print(f"  rewrote {count} <img data-responsive> in {page.relative_to(public)}")
+        referenced.update(s for s in built if f"{URL_PREFIX}{s.relative_to(public).as_posix()}" in page.read_text())
+
+    if not args.keep_originals and not args.dry_run:
+        # Originals still referenced somewhere other than a rewritten tag stay, so no page breaks.
+        for source in built:
+            if source not in referenced:
+                source.unlink()
+                print(f"  removed original {source.relative_to(public)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Load-test the backend's user lookups against a local DynamoDB.
+
+Compares two ways one instance can serve many concurrent `get_user` calls:
+  threadpool  boto3 Table.get_item on a fixed thread pool. This is the old
+              path, where sync FastAPI routes run on Starlette's 40-thread pool.
+  async       users.get_user on the shared aiobotocore client, as the async
+              routes do now.
+
+The user cache is disabled, so every call reaches DynamoDB. Prints
+throughput and latency per concurrency level. The thread-pool path levels
+off once concurrency passes --threads. The async path keeps scaling until
+the connection pool (DYNAMODB_MAX_CONNECTIONS) or the server is the limit.
+
+Start DynamoDB Local first (the table is created and seeded automatically):
+    docker run --rm -p 8001:8000 amazon/dynamodb-local
+    python3 scripts/load-dynamodb.py --endpoint-url http://localhost:8001
+    python3 scripts/load-dynamodb.py --concurrency 50 200 500 --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent / "dashboard-app" / "backend"
+
+
+def seed_table(endpoint_url: str, table_name: str, users: int, threads: int):
+    import boto3
+    from botocore.config import Config
+
+    # One connection per thread, so the threadpool mode is limited by threads, not sockets.
+    dynamodb = boto3.resource("dynamodb", region_name=os.environ["AWS_REGION"], endpoint_url=endpoint_url,
+                              config=Config(max_pool_connections=threads))
+    existing = {t.name for t in dynamodb.tables.all()}
+    if table_name not in existing:
+        dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[{"AttributeName": "email", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "email", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        ).wait_until_exists()
+    table = dynamodb.Table(table_name)
+    # Lookups never verify passwords, so a placeholder hash keeps seeding instant.
+    with table.batch_writer() as batch:
+        for i in range(users):
+            batch.put_item(Item={"email": f"load{i}@example.com", "name": f"Load User {i}", "password": "x"})
+    return table
+
+
+def summarize(latencies_ms: list, elapsed: float) -> dict:
+    ordered = sorted(latencies_ms)
+    return {
+        "rps": len(ordered) / elapsed,
+        "p50": statistics.median(ordered),
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+    }
+
+
+async def drive(call, requests: int, concurrency: int, users: int) -> dict:
+    """Issue `requests` calls with at most `concurrency` in flight."""
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with gate:
+            started = time.perf_counter()
+            user = await call(f"load{i % users}@example.com")
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not user:
+                raise RuntimeError(f"load{i % users}@example.com not found")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run(args):
+    import users  # configured through the environment set in main()
+
+    table = seed_table(args.endpoint_url, args.table, args.users, args.threads)
+    pool = ThreadPoolExecutor(max_workers=args.threads)
+    loop = asyncio.get_running_loop()
+
+    async def threadpool_get(email):
+        response = await loop.run_in_executor(pool, lambda: table.get_item(Key={"email": email}))
+        return response.get("Item")
+
+    modes = {"threadpool": threadpool_get, "async": users.get_user}
+    for call in modes.values():
+        await drive(call, min(args.requests, 200), 20, args.users)  # warm connections
+
+    print(f"{'concurrency':>11} {'mode':<10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for concurrency in args.concurrency:
+        for mode, call in modes.items():
+            stats = await drive(call, args.requests, concurrency, args.users)
+            print(f"{concurrency:>11} {mode:<10} {stats['rps']:>9.0f} {stats['p50']:>8.2f} {stats['p99']:>8.2f}")
+    pool.shutdown()
+    await users.users_table_async.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint-url", default=os.getenv("DYNAMODB_ENDPOINT_URL", "http://localhost:8001"))
+    parser.add_argument("--table", default="dashboard-users-loadtest")
+    parser.add_argument("--users", type=int, default=200, help="Users to seed and look up")
+    parser.add_argument("--requests", type=int, default=2000, help="Lookups per mode and concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 40, 100, 250])
+    parser.add_argument("--threads", type=int, default=40, help="Thread pool size for the threadpool mode")
+    args = parser.parse_args()
+
+    # DynamoDB Local accepts any credentials but botocore insists on some.
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "local")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "local")
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    os.environ.update({
+        "DYNAMODB_ENDPOINT_URL": args.endpoint_url,
+        "DASHBOARD_USERS_TABLE": args.table,
+        "DRY_RUN": "false",
+        "USER_CACHE_TTL": "0",
+        "LOG_LEVEL": "WARNING",
+    })
+    sys.path.insert(0, str(BACKEND))
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Report where the Lambda handler spends its import (cold-start init) time.
+
+Imports dashboard-app/backend/main.py in a fresh interpreter with
+`python -X importtime` and prints the total plus the slowest modules by
+cumulative and self time. Runs in DRY_RUN mode so no AWS calls are made.
+
+Usage (needs the backend requirements installed):
+    python3 scripts/profile-imports.py
+    python3 scripts/profile-imports.py --top 30 --env EAGER_INIT=true
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent / "dashboard-app" / "backend"
+
+
+def parse_importtime(stderr: str) -> list:
+    """Return (self_us, cumulative_us, depth, module) for every `import time:` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra environment for the import, e.g. EAGER_INIT=true")
+    args = parser.parse_args()
+
+    env = {**os.environ, "DRY_RUN": "true"}
+    env.update(pair.split("=", 1) for pair in args.env)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND, env=env, capture_output=True, text=True
+    )
+    if proc.returncode:
+        sys.exit(f"Importing main failed:\n{proc.stderr[-2000:]}")
+
+    rows = parse_importtime(proc.stderr)
+    # main's cumulative time covers its module body too, i.e. the whole Lambda init.
+    total_us = next((cum for _, cum, _, name in reversed(rows) if name == "main"), sum(r[0] for r in rows))
+    print(f"Total import time for main: {total_us / 1000:.1f} ms ({len(rows)} modules)\n")
+
+    print(f"Slowest by cumulative time (top {args.top}):")
+    for self_us, cumulative_us, _, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    print(f"\nSlowest by self time (top {args.top}):")
+    for self_us, _, _, name in sorted(rows, key=lambda r: r[0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()